@@ -1,16 +1,21 @@
 # File: backend/app/api/n8n.py
 # NEW FILE - API endpoint for N8N to send enriched data back
 
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, exists
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 from uuid import UUID
 
 from app.database import get_db
 from app.models import Reference
+from app.services.cache_service import CacheService, REFERENCE_IDS_KEY, REFERENCE_IDS_TTL
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 class EnrichmentData(BaseModel):
@@ -26,7 +31,7 @@ class EnrichmentData(BaseModel):
 @router.post("/enrichment")
 async def receive_enrichment(
     data: EnrichmentData,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Receive enriched reference data from N8N workflow.
@@ -35,28 +40,34 @@ async def receive_enrichment(
     with external data (citations, academic metadata, etc.)
     """
     try:
-        # Find the reference
+        # Validate the reference, checking the cached id set before the DB
         reference_id = UUID(data.reference_id)
-        reference = db.query(Reference).filter(
-            Reference.reference_id == reference_id
-        ).first()
+        cache = CacheService()
         
-        if not reference:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Reference not found"
+        if not await cache.is_member(REFERENCE_IDS_KEY, str(reference_id)):
+            reference_exists = await db.scalar(
+                select(exists().where(Reference.reference_id == reference_id))
             )
+            if not reference_exists:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Reference not found"
+                )
+            await cache.add_member(REFERENCE_IDS_KEY, str(reference_id), expire=REFERENCE_IDS_TTL)
         
         # Store enrichment data (you can add a JSON field to Reference model)
         # For now, we'll just log it
-        print(f"✅ Received enrichment for {reference.url}:")
-        print(f"   - Citations found: {data.enrichment.get('citations_found', 0)}")
-        print(f"   - Citation count: {data.enrichment.get('citation_count', 0)}")
-        print(f"   - DOI: {data.enrichment.get('doi', 'N/A')}")
+        logger.info(
+            "Received enrichment for %s: citations_found=%s citation_count=%s doi=%s",
+            data.url,
+            data.enrichment.get('citations_found', 0),
+            data.enrichment.get('citation_count', 0),
+            data.enrichment.get('doi', 'N/A'),
+        )
         
         # TODO: Store in database (add enrichment_data JSON field to Reference model)
         # reference.enrichment_data = data.enrichment
-        # db.commit()
+        # await db.commit()
         
         return {
             "success": True,
@@ -1,24 +1,35 @@
 # File: backend/app/api/ratings.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import select, func, exists
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 from app.database import get_db
 from app.models import User, Reference, UserRating
 from app.schemas.reference import RatingCreate, RatingResponse
 from app.utils.security import get_current_user
+from app.services.cache_service import CacheService
 
 router = APIRouter()
 
+# Aggregates are public and change only when a rating is written
+AGGREGATE_CACHE_TTL = 300
+
+
+def aggregate_cache_key(reference_id: UUID) -> str:
+    """Cache key for a reference's aggregate rating."""
+    return f"agg:{reference_id}"
+
 
 @router.post("/{reference_id}", response_model=RatingResponse, status_code=status.HTTP_201_CREATED)
 async def create_rating(
     reference_id: UUID,
     rating_data: RatingCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Submit a rating for a reference."""
     
@@ -29,80 +40,86 @@ async def create_rating(
             detail="Rating must be between 1 and 5"
         )
     
-    # Check if reference exists
-    reference = db.query(Reference).filter(Reference.reference_id == reference_id).first()
-    if not reference:
+    # Insert or update the user's rating in one atomic statement.
+    # A missing reference surfaces as a foreign key violation.
+    stmt = (
+        insert(UserRating)
+        .values(
+            user_id=current_user.user_id,
+            reference_id=reference_id,
+            rating=rating_data.rating,
+            comment=rating_data.comment
+        )
+        .on_conflict_do_update(
+            constraint="unique_user_reference_rating",
+            set_={"rating": rating_data.rating, "comment": rating_data.comment}
+        )
+        .returning(UserRating)
+    )
+    
+    try:
+        result = await db.execute(stmt, execution_options={"populate_existing": True})
+        rating = result.scalar_one()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reference not found"
         )
     
-    # Check if user already rated this reference
-    existing_rating = db.query(UserRating).filter(
-        UserRating.user_id == current_user.user_id,
-        UserRating.reference_id == reference_id
-    ).first()
-    
-    if existing_rating:
-        # Update existing rating
-        existing_rating.rating = rating_data.rating
-        existing_rating.comment = rating_data.comment
-        db.commit()
-        db.refresh(existing_rating)
-        return existing_rating
+    await CacheService().delete(aggregate_cache_key(reference_id))
     
-    # Create new rating
-    new_rating = UserRating(
-        user_id=current_user.user_id,
-        reference_id=reference_id,
-        rating=rating_data.rating,
-        comment=rating_data.comment
-    )
-    
-    db.add(new_rating)
-    db.commit()
-    db.refresh(new_rating)
-    
-    return new_rating
+    return rating
 
 
 @router.get("/{reference_id}/aggregate")
 async def get_aggregate_rating(
     reference_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get aggregate rating statistics for a reference."""
+    cache = CacheService()
+    cached = await cache.get(aggregate_cache_key(reference_id))
+    if cached is not None:
+        return cached
     
     # Check if reference exists
-    reference = db.query(Reference).filter(Reference.reference_id == reference_id).first()
-    if not reference:
+    reference_exists = await db.scalar(
+        select(exists().where(Reference.reference_id == reference_id))
+    )
+    if not reference_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reference not found"
         )
     
-    # Calculate aggregate statistics
-    ratings = db.query(UserRating).filter(UserRating.reference_id == reference_id).all()
+    # Calculate distribution server-side (at most 5 rows, one per rating value)
+    result = await db.execute(
+        select(UserRating.rating, func.count().label("count"))
+        .where(UserRating.reference_id == reference_id)
+        .group_by(UserRating.rating)
+    )
     
-    if not ratings:
-        return {
-            "reference_id": reference_id,
-            "average_rating": None,
-            "total_ratings": 0,
-            "rating_distribution": {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-        }
+    distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
+    for rating, count in result:
+        distribution[rating] = count
     
-    # Calculate average
-    avg_rating = sum(r.rating for r in ratings) / len(ratings)
+    total_ratings = sum(distribution.values())
     
-    # Calculate distribution
-    distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-    for rating in ratings:
-        distribution[rating.rating] += 1
+    # Derive average from the grouped counts
+    avg_rating = None
+    if total_ratings:
+        avg_rating = round(
+            sum(rating * count for rating, count in distribution.items()) / total_ratings, 2
+        )
     
-    return {
+    aggregate = {
         "reference_id": reference_id,
-        "average_rating": round(avg_rating, 2),
-        "total_ratings": len(ratings),
+        "average_rating": avg_rating,
+        "total_ratings": total_ratings,
         "rating_distribution": distribution
-    }
\ No newline at end of file
+    }
+    await cache.set(aggregate_cache_key(reference_id), aggregate, expire=AGGREGATE_CACHE_TTL)
+    
+    return aggregate
\ No newline at end of file
@@ -1,135 +1,187 @@
 # File: backend/app/api/references.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from typing import List, Optional, Tuple
+from datetime import datetime
 from uuid import UUID
+import base64
+import orjson
 
-from app.database import get_db
+from app.database import get_db, AsyncSessionLocal
 from app.models import User, Reference
 from app.models.reference import ReferenceStatus
-from app.schemas.reference import ReferenceCreate, ReferenceResponse, ReferenceDetailResponse
+from app.schemas.reference import (
+    ReferenceCreate,
+    ReferenceBatchCreate,
+    ReferenceResponse,
+    ReferenceDetailResponse,
+)
 from app.utils.security import get_current_user
 from app.services.reference_service import ReferenceService
-from app.services.credibility_analyzer import CredibilityAnalyzer
-from app.services.n8n_service import N8NService
+from app.services.cache_service import CacheService, REFERENCE_IDS_KEY, REFERENCE_IDS_TTL
+from app.api.ratings import aggregate_cache_key
+from app.worker import run_credibility_analysis_task, run_credibility_analysis_batch_task
 
 router = APIRouter()
 
-async def run_credibility_analysis(reference_id: UUID, db: Session):
-    """
-    Background task to run credibility analysis on a reference.
-    
-    Args:
-        reference_id: UUID of reference to analyze
-        db: Database session
-    """
+
+def _encode_cursor(reference: Reference) -> str:
+    """Encode the (created_at, reference_id) keyset position of a row."""
+    raw = f"{reference.created_at.isoformat()}|{reference.reference_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a history cursor back into its keyset position."""
     try:
-        # Get reference
-        reference = db.query(Reference).filter(
-            Reference.reference_id == reference_id
-        ).first()
-        
-        if not reference:
-            return
-        
-        # Run credibility analysis
-        analyzer = CredibilityAnalyzer(db)
-        report = await analyzer.analyze_reference(reference)
-        
-        try:
-            n8n_service = N8NService()
-            await n8n_service.send_reference_analyzed(
-                reference_id=str(reference.reference_id),
-                url=reference.url,
-                title=reference.title,
-                author=reference.author,
-                domain=reference.domain,
-                credibility_score=report.total_score,
-                breakdown={
-                    "domain_score": report.domain_score,
-                    "metadata_score": report.metadata_score,
-                    "rag_score": report.rag_score,
-                    "ai_score": report.ai_score
-                }
-            )
-        except Exception as n8n_error:
-            # Don't fail analysis if N8N webhook fails
-            print(f"⚠️  N8N webhook failed (analysis still succeeded): {n8n_error}")
-        
-    except Exception as e:
-        # If analysis fails, update reference status
-        reference = db.query(Reference).filter(
-            Reference.reference_id == reference_id
-        ).first()
-        
-        if reference:
-            reference.status = ReferenceStatus.failed
-            db.commit()
-        
-        # Log error
-        print(f"❌ Credibility analysis failed for {reference_id}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        created_at, reference_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(reference_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
 
 
 @router.post("/check", response_model=ReferenceResponse, status_code=status.HTTP_201_CREATED)
 async def check_reference(
     reference_data: ReferenceCreate,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Submit a reference for credibility checking.
     Returns immediately with status 'processing'.
-    Analysis happens in background + sends to N8N.
+    Analysis is queued for the worker, which then notifies N8N.
     """
     service = ReferenceService(db)
     reference = await service.create_reference(reference_data.url, current_user.user_id)
+    await CacheService().add_member(
+        REFERENCE_IDS_KEY, str(reference.reference_id), expire=REFERENCE_IDS_TTL
+    )
     
-    background_tasks.add_task(
-        run_credibility_analysis,
-        reference.reference_id,
-        db
+    run_credibility_analysis_task.apply_async(
+        args=[str(reference.reference_id)],
+        queue="analysis",
+        priority=5
     )
     
     return reference
 
 
+@router.post("/check/batch", response_model=List[ReferenceResponse], status_code=status.HTTP_201_CREATED)
+async def check_references_batch(
+    batch: ReferenceBatchCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Submit several references at once.
+    Pages are scraped concurrently and stored in one transaction;
+    the batch is then queued as a single analysis task.
+    """
+    service = ReferenceService(db)
+    references = await service.create_references(batch.urls, current_user.user_id)
+    
+    cache = CacheService()
+    reference_ids = [str(reference.reference_id) for reference in references]
+    for reference_id in reference_ids:
+        await cache.add_member(REFERENCE_IDS_KEY, reference_id, expire=REFERENCE_IDS_TTL)
+    
+    # One task for the whole batch lets the strategies share API calls
+    run_credibility_analysis_batch_task.apply_async(
+        args=[reference_ids],
+        queue="analysis",
+        priority=5
+    )
+    
+    return references
+
+
 @router.get("/history", response_model=List[ReferenceResponse])
 async def get_reference_history(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
     limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get user's reference checking history with pagination."""
-    references = (
-        db.query(Reference)
-        .filter(Reference.user_id == current_user.user_id)
-        .order_by(Reference.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    """
+    Get user's reference checking history with keyset pagination.
+    
+    Pass the X-Next-Cursor response header back as `cursor` to fetch
+    the next page; the header is absent on the last page.
+    """
+    stmt = select(Reference).where(Reference.user_id == current_user.user_id)
+    
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(Reference.created_at, Reference.reference_id) < tuple_(cursor_created_at, cursor_id)
+        )
+    
+    result = await db.execute(
+        stmt
+        .order_by(Reference.created_at.desc(), Reference.reference_id.desc())
+        .limit(limit + 1)
     )
+    references = result.scalars().all()
     
-    return references
+    headers = {}
+    if len(references) > limit:
+        references = references[:limit]
+        headers["X-Next-Cursor"] = _encode_cursor(references[-1])
+    
+    # Rows come straight from our database: build the response without re-validating
+    return ORJSONResponse(
+        [ReferenceResponse.from_orm_fast(reference).model_dump() for reference in references],
+        headers=headers
+    )
+
+
+@router.get("/history/export")
+async def export_reference_history(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream the user's full reference history as NDJSON.
+    
+    Rows are read through a server-side cursor, so memory stays flat
+    no matter how large the history is.
+    """
+    user_id = current_user.user_id
+    
+    async def generate():
+        # Own session: the response body is produced after the handler returns
+        async with AsyncSessionLocal() as session:
+            result = await session.stream_scalars(
+                select(Reference)
+                .where(Reference.user_id == user_id)
+                .order_by(Reference.created_at.desc(), Reference.reference_id.desc())
+                .execution_options(yield_per=500)
+            )
+            async for reference in result:
+                row = ReferenceResponse.from_orm_fast(reference).model_dump()
+                yield orjson.dumps(row) + b"\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
 @router.get("/{reference_id}", response_model=ReferenceDetailResponse)
 async def get_reference_detail(
     reference_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get detailed information about a specific reference."""
-    reference = db.query(Reference).filter(
-        Reference.reference_id == reference_id,
-        Reference.user_id == current_user.user_id
-    ).first()
+    reference = await db.get(
+        Reference, reference_id, options=[joinedload(Reference.credibility_report)]
+    )
     
-    if not reference:
+    if not reference or reference.user_id != current_user.user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reference not found"
@@ -141,38 +193,35 @@ async def get_reference_detail(
     }
 
 
-@router.post("/{reference_id}/reanalyze", response_model=ReferenceResponse)
+@router.post("/{reference_id}/reanalyze", response_model=ReferenceResponse, status_code=status.HTTP_202_ACCEPTED)
 async def reanalyze_reference(
     reference_id: UUID,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Manually trigger re-analysis of a reference.
     Useful if the original analysis failed or you want updated results.
+    Returns immediately with status 'processing'; poll GET /{id} for the report.
     """
-    reference = db.query(Reference).filter(
-        Reference.reference_id == reference_id,
-        Reference.user_id == current_user.user_id
-    ).first()
+    reference = await db.get(Reference, reference_id)
     
-    if not reference:
+    if not reference or reference.user_id != current_user.user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reference not found"
         )
     
     reference.status = ReferenceStatus.processing
-    db.commit()
+    reference.credibility_score = None
+    await db.commit()
     
-    background_tasks.add_task(
-        run_credibility_analysis,
-        reference.reference_id,
-        db
+    run_credibility_analysis_task.apply_async(
+        args=[str(reference.reference_id)],
+        queue="analysis",
+        priority=5
     )
     
-    db.refresh(reference)
     return reference
 
 
@@ -180,21 +229,26 @@ async def reanalyze_reference(
 async def delete_reference(
     reference_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a reference from history."""
-    reference = db.query(Reference).filter(
-        Reference.reference_id == reference_id,
-        Reference.user_id == current_user.user_id
-    ).first()
+    # Cascaded children are loaded up front: one query each instead of lazy loads
+    reference = await db.get(
+        Reference,
+        reference_id,
+        options=[joinedload(Reference.credibility_report), selectinload(Reference.ratings)]
+    )
     
-    if not reference:
+    if not reference or reference.user_id != current_user.user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reference not found"
         )
     
-    db.delete(reference)
-    db.commit()
+    await db.delete(reference)
+    await db.commit()
+    cache = CacheService()
+    await cache.delete(aggregate_cache_key(reference_id))
+    await cache.remove_member(REFERENCE_IDS_KEY, str(reference_id))
     
     return None
\ No newline at end of file
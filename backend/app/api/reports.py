@@ -1,7 +1,8 @@
 # File: backend/app/api/reports.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from uuid import UUID
 
 from app.database import get_db
@@ -16,26 +17,26 @@ router = APIRouter()
 async def get_credibility_report(
     reference_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get credibility report for a reference."""
     
     # Verify reference belongs to user
-    reference = db.query(Reference).filter(
-        Reference.reference_id == reference_id,
-        Reference.user_id == current_user.user_id
-    ).first()
+    reference = await db.get(
+        Reference, reference_id, options=[joinedload(Reference.credibility_report)]
+    )
     
-    if not reference:
+    if not reference or reference.user_id != current_user.user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reference not found"
         )
     
-    if not reference.credibility_report:
+    report = reference.credibility_report
+    if not report:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Credibility report not yet generated"
         )
     
-    return reference.credibility_report
\ No newline at end of file
+    return report
\ No newline at end of file
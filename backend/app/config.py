@@ -1,6 +1,7 @@
 # File: backend/app/config.py
 
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
 
 
@@ -13,24 +14,38 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_HOURS: int = 24
     
+    # Password hashing cost (log2 of bcrypt iterations); tests lower it
+    BCRYPT_ROUNDS: int = 12
+    
     # Anthropic API
     ANTHROPIC_API_KEY: str
     
     # Embeddings
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
     
+    # RAG proximity cache: entries kept, and max cosine distance for a hit
+    RAG_CACHE_MAX_SIZE: int = 1024
+    RAG_CACHE_TAU: float = 0.1
+    
     # N8N Webhooks
     N8N_WEBHOOK_BASE_URL: str 
     N8N_REFERENCE_WEBHOOK: str = "/webhook/reference-check"
     
+    # Redis (response cache)
+    REDIS_URL: str = "redis://localhost:6379/0"
+    
     # Application
     ENVIRONMENT: str = "development"
     LOG_LEVEL: str = "INFO"
     CORS_ORIGINS: List[str] = ["http://localhost:5173", "http://localhost:3000"]
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, frozen=True)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsing the environment only once."""
+    return Settings()
 
 
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
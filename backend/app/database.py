@@ -1,16 +1,24 @@
 # File: backend/app/database.py
 
+import os
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.config import settings
+from app.config import get_settings
+
+settings = get_settings()
 
 # Fix postgres:// to postgresql:// if needed
 DATABASE_URL = settings.DATABASE_URL
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
 # Create engine (Singleton pattern - shared connection pool)
+# Used by background analysis, scripts and the MCP server, which run outside the event loop.
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,  # Verify connections before using
@@ -18,21 +26,34 @@ engine = create_engine(
     max_overflow=10,
 )
 
-# Session factory
+# Async engine for API handlers so DB I/O never blocks the event loop
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=max(10, (os.cpu_count() or 1) * 2),
+    max_overflow=20,
+    pool_recycle=1800,  # Recycle before server/proxy idle timeouts drop connections
+    pool_use_lifo=True,  # Reuse the most recently returned (warm) connection
+    echo_pool=settings.ENVIRONMENT == "development",
+    connect_args={
+        "prepared_statement_cache_size": 512,  # SQLAlchemy adapter cache
+        "statement_cache_size": 512,  # asyncpg server-side prepared statements
+    },
+)
+
+# Session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
-# Base class for models
-Base = declarative_base()
+# Base class for models (AsyncAttrs allows awaiting lazy relationships)
+Base = declarative_base(cls=AsyncAttrs)
 
 
 # Dependency for FastAPI routes
-def get_db():
+async def get_db():
     """
-    Database session dependency for FastAPI.
-    Usage in routes: def my_route(db: Session = Depends(get_db))
+    Async database session dependency for FastAPI.
+    Usage in routes: async def my_route(db: AsyncSession = Depends(get_db))
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
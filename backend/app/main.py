@@ -1,28 +1,48 @@
 # File: backend/app/main.py
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.config import settings
+from app.config import get_settings
 from app.database import engine, Base
 from app.api import auth, references, reports, ratings
+from app.services.scraper_service import browser_pool, close_static_client
+from app.utils.logging_config import setup_logging
+
+setup_logging()
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release pooled outbound connections on shutdown
+    await close_static_client()
+    await browser_pool.close()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Reference Checker API",
     description="API for checking credibility of academic references",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=get_settings().CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["authorization", "content-type"],
+    expose_headers=["X-Next-Cursor"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 # Include routers
@@ -1,11 +1,9 @@
 # File: backend/app/models/credibility_report.py
 # Save to: backend/app/models/credibility_report.py
 
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, func, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-from datetime import datetime
-import uuid
 
 from app.database import Base
 
@@ -13,7 +11,7 @@ from app.database import Base
 class CredibilityReport(Base):
     __tablename__ = "credibility_reports"
 
-    report_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    report_id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     reference_id = Column(UUID(as_uuid=True), ForeignKey("references.reference_id"), unique=True, nullable=False)
     
     # Score components
@@ -32,7 +30,7 @@ class CredibilityReport(Base):
     # Red flags (stored as JSON array)
     red_flags = Column(JSONB, nullable=True, default=[])
     
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
     reference = relationship("Reference", back_populates="credibility_report")
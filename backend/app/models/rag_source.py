@@ -1,11 +1,9 @@
 # File: backend/app/models/rag_source.py
 # Save to: backend/app/models/rag_source.py
 
-from sqlalchemy import Column, String, Text, Integer, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, Integer, DateTime, Index, func, text, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
-from pgvector.sqlalchemy import Vector
-from datetime import datetime
-import uuid
+from pgvector.sqlalchemy import HALFVEC
 import enum
 
 from app.database import Base
@@ -20,15 +18,27 @@ class SourceAddedBy(enum.Enum):
 class RAGSource(Base):
     __tablename__ = "rag_sources"
 
-    source_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    source_id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     url = Column(Text, unique=True, nullable=False)
     title = Column(String(500), nullable=True)
     content_text = Column(Text, nullable=True)
-    embedding_vector = Column(Vector(384), nullable=True)  # 384 dimensions for sentence-transformers/all-MiniLM-L6-v2
+    # 384 dimensions for sentence-transformers/all-MiniLM-L6-v2, stored as fp16 (half the bytes per HNSW scan)
+    embedding_vector = Column(HALFVEC(384), nullable=True)
     domain = Column(String(255), nullable=True, index=True)
     credibility_score = Column(Integer, nullable=True)
     added_by = Column(SQLEnum(SourceAddedBy), default=SourceAddedBy.manual, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # ANN index for nearest-neighbour search. Stored vectors are unit
+        # length, so inner product ranks exactly like cosine and skips the norms.
+        Index(
+            "ix_rag_sources_embedding_hnsw",
+            embedding_vector,
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding_vector": "halfvec_ip_ops"},
+        ),
+    )
 
     def __repr__(self):
         return f"<RAGSource {self.title[:50]}... (score: {self.credibility_score})>"
\ No newline at end of file
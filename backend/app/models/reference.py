@@ -1,11 +1,9 @@
 # File: backend/app/models/reference.py
 # Save to: backend/app/models/reference.py
 
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Date, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Date, Index, func, text, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from datetime import datetime
-import uuid
 import enum
 
 from app.database import Base
@@ -20,7 +18,7 @@ class ReferenceStatus(enum.Enum):
 class Reference(Base):
     __tablename__ = "references"
 
-    reference_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    reference_id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
     url = Column(String, nullable=False)
     title = Column(String(500), nullable=True)
@@ -28,14 +26,29 @@ class Reference(Base):
     publication_date = Column(Date, nullable=True)
     domain = Column(String(255), nullable=True, index=True)
     credibility_score = Column(Integer, nullable=True)
-    status = Column(SQLEnum(ReferenceStatus), default=ReferenceStatus.processing, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    status = Column(SQLEnum(ReferenceStatus), server_default=text("'processing'"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    # Fetch DB-generated values (e.g. updated_at) via RETURNING instead of expiring them
+    __mapper_args__ = {"eager_defaults": True}
+
+    __table_args__ = (
+        # Keyset pagination for history: (user_id, created_at DESC, reference_id DESC)
+        Index("ix_references_user_created", user_id, created_at.desc(), reference_id.desc()),
+        # Small partial index over in-flight analyses (stuck/pending sweeps)
+        Index(
+            "ix_references_processing",
+            created_at,
+            postgresql_where=(status == ReferenceStatus.processing),
+        ),
+    )
 
     # Relationships
     user = relationship("User", back_populates="references")
     credibility_report = relationship("CredibilityReport", back_populates="reference", uselist=False, cascade="all, delete-orphan")
-    ratings = relationship("UserRating", back_populates="reference", cascade="all, delete-orphan")
+    # lazy="raise": ratings must be eager-loaded explicitly (no hidden N+1)
+    ratings = relationship("UserRating", back_populates="reference", cascade="all, delete-orphan", lazy="raise")
 
     def __repr__(self):
         return f"<Reference {self.url[:50]}... (score: {self.credibility_score})>"
\ No newline at end of file
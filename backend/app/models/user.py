@@ -1,10 +1,8 @@
 # File: backend/app/models/user.py
 
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from datetime import datetime
-import uuid
 
 from app.database import Base
 
@@ -12,15 +10,16 @@ from app.database import Base
 class User(Base):
     __tablename__ = "users"
 
-    user_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     last_login = Column(DateTime, nullable=True)
 
     # Relationships
-    references = relationship("Reference", back_populates="user", cascade="all, delete-orphan")
-    ratings = relationship("UserRating", back_populates="user", cascade="all, delete-orphan")
+    # lazy="raise": collections must be eager-loaded explicitly (no hidden N+1)
+    references = relationship("Reference", back_populates="user", cascade="all, delete-orphan", lazy="raise")
+    ratings = relationship("UserRating", back_populates="user", cascade="all, delete-orphan", lazy="raise")
 
     def __repr__(self):
         return f"<User {self.email}>"
\ No newline at end of file
@@ -1,11 +1,9 @@
 # File: backend/app/models/user_rating.py
 # Save to: backend/app/models/user_rating.py
 
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Index, UniqueConstraint, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from datetime import datetime
-import uuid
 
 from app.database import Base
 
@@ -14,14 +12,16 @@ class UserRating(Base):
     __tablename__ = "user_ratings"
     __table_args__ = (
         UniqueConstraint('user_id', 'reference_id', name='unique_user_reference_rating'),
+        # Backs the aggregate GROUP BY rating with an index-only scan
+        Index('ix_user_ratings_reference_rating', 'reference_id', 'rating'),
     )
 
-    rating_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    rating_id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
     reference_id = Column(UUID(as_uuid=True), ForeignKey("references.reference_id"), nullable=False)
     rating = Column(Integer, nullable=False)  # 1-5
     comment = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="ratings")
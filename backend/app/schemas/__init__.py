@@ -0,0 +1,28 @@
+# File: backend/app/schemas/__init__.py
+
+# Importing the schemas here builds their Pydantic core schemas at import
+# time, not on the first request that touches them.
+from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
+from app.schemas.reference import (
+    ReferenceCreate,
+    ReferenceBatchCreate,
+    ReferenceResponse,
+    CredibilityReportResponse,
+    ReferenceDetailResponse,
+    RatingCreate,
+    RatingResponse,
+)
+
+__all__ = [
+    "UserCreate",
+    "UserLogin",
+    "UserResponse",
+    "Token",
+    "ReferenceCreate",
+    "ReferenceBatchCreate",
+    "ReferenceResponse",
+    "CredibilityReportResponse",
+    "ReferenceDetailResponse",
+    "RatingCreate",
+    "RatingResponse",
+]
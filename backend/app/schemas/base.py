@@ -0,0 +1,25 @@
+# File: backend/app/schemas/base.py
+
+import enum
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class FastConstruct(BaseModel):
+    """
+    Mixin for response schemas built from trusted ORM rows.
+    
+    from_orm_fast() skips validation entirely; use it only for data read
+    from our own database, never for request bodies.
+    """
+    
+    @classmethod
+    def from_orm_fast(cls, obj: Any):
+        """Build the schema from an ORM object without validation."""
+        values = {}
+        for field in cls.model_fields:
+            value = getattr(obj, field, None)
+            # Enum columns are exposed as their plain values
+            values[field] = value.value if isinstance(value, enum.Enum) else value
+        return cls.model_construct(**values)
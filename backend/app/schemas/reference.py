@@ -1,16 +1,26 @@
 # File: backend/app/schemas/reference.py
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 from datetime import datetime, date
 from uuid import UUID
-from typing import Optional
+from typing import List, Optional
+
+from app.schemas.base import FastConstruct
+
+
+# Upper bound on URLs per batch submission
+MAX_BATCH_URLS = 20
 
 
 class ReferenceCreate(BaseModel):
     url: str
 
 
-class ReferenceResponse(BaseModel):
+class ReferenceBatchCreate(BaseModel):
+    urls: List[str] = Field(min_length=1, max_length=MAX_BATCH_URLS)
+
+
+class ReferenceResponse(FastConstruct):
     reference_id: UUID
     url: str
     title: Optional[str]
@@ -22,11 +32,10 @@ class ReferenceResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
-class CredibilityReportResponse(BaseModel):
+class CredibilityReportResponse(FastConstruct):
     report_id: UUID
     reference_id: UUID
     domain_score: int
@@ -41,16 +50,14 @@ class CredibilityReportResponse(BaseModel):
     red_flags: list
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class ReferenceDetailResponse(BaseModel):
     reference: ReferenceResponse
     report: Optional[CredibilityReportResponse]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class RatingCreate(BaseModel):
@@ -58,11 +65,10 @@ class RatingCreate(BaseModel):
     comment: Optional[str] = None
 
 
-class RatingResponse(BaseModel):
+class RatingResponse(FastConstruct):
     rating_id: UUID
     rating: int
     comment: Optional[str]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, frozen=True)
\ No newline at end of file
@@ -1,18 +1,19 @@
 # File: backend/app/schemas/user.py
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from uuid import UUID
 from datetime import datetime
 from typing import Optional
 
+from app.schemas.base import FastConstruct
+
 
 class UserCreate(BaseModel):
     """Schema for user registration"""
     email: EmailStr
     password: str
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserLogin(BaseModel):
@@ -21,19 +22,20 @@ class UserLogin(BaseModel):
     password: str
 
 
-class UserResponse(BaseModel):
+class UserResponse(FastConstruct):
     """Schema for user data in responses"""
     user_id: UUID
     email: str
     created_at: datetime
     last_login: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class Token(BaseModel):
     """Schema for JWT token response"""
     access_token: str
     token_type: str
-    user: UserResponse
\ No newline at end of file
+    user: UserResponse
+    
+    model_config = ConfigDict(frozen=True)
\ No newline at end of file
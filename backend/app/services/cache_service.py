@@ -0,0 +1,95 @@
+# File: backend/app/services/cache_service.py
+
+import json
+import logging
+import time
+from typing import Any, Optional
+
+import redis.asyncio as redis
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+# Shared async Redis client (connection pool is created lazily on first command)
+redis_client = redis.Redis.from_url(get_settings().REDIS_URL, decode_responses=True)
+
+# Known reference ids, used to validate N8N callbacks without a DB hit.
+# A sorted set scored by expiry time, so each id expires on its own.
+REFERENCE_IDS_KEY = "ref_id_expiry"
+REFERENCE_IDS_TTL = 3600
+
+
+class CacheService:
+    """
+    Small JSON cache on top of Redis.
+    
+    Cache failures are never fatal: reads fall through to the caller's
+    source of truth and writes are skipped when Redis is unavailable.
+    """
+    
+    def __init__(self, prefix: str = "refchk"):
+        self.prefix = prefix
+        self.client = redis_client
+    
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on miss or error."""
+        try:
+            value = await self.client.get(self._key(key))
+        except redis.RedisError as e:
+            logger.warning("Cache read failed for %s: %s", key, e)
+            return None
+        
+        return json.loads(value) if value is not None else None
+    
+    async def set(self, key: str, value: Any, expire: int) -> None:
+        """Store a JSON-serializable value for `expire` seconds."""
+        try:
+            await self.client.set(self._key(key), json.dumps(value, default=str), ex=expire)
+        except redis.RedisError as e:
+            logger.warning("Cache write failed for %s: %s", key, e)
+    
+    async def delete(self, key: str) -> None:
+        """Invalidate a cached value."""
+        try:
+            await self.client.delete(self._key(key))
+        except redis.RedisError as e:
+            logger.warning("Cache invalidation failed for %s: %s", key, e)
+
+    async def add_member(self, key: str, member: str, expire: int) -> None:
+        """
+        Add member to a cached set for `expire` seconds.
+        
+        The set is a sorted set scored by each member's expiry time, so
+        members expire individually: expired ones are pruned on every
+        write and ignored on read, and the set cannot grow without bound.
+        """
+        now = time.time()
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.zadd(self._key(key), {member: now + expire})
+                pipe.zremrangebyscore(self._key(key), "-inf", now)
+                await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning("Cache write failed for %s: %s", key, e)
+    
+    async def is_member(self, key: str, member: str) -> bool:
+        """Return True if member is in the cached set and unexpired (False on miss or error)."""
+        try:
+            expires_at = await self.client.zscore(self._key(key), member)
+        except redis.RedisError as e:
+            logger.warning("Cache read failed for %s: %s", key, e)
+            return False
+        
+        return expires_at is not None and expires_at > time.time()
+    
+    async def remove_member(self, key: str, member: str) -> None:
+        """Remove member from a cached set."""
+        try:
+            await self.client.zrem(self._key(key), member)
+        except redis.RedisError as e:
+            logger.warning("Cache invalidation failed for %s: %s", key, e)
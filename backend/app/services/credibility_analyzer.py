@@ -1,8 +1,9 @@
 # File: backend/app/services/credibility_analyzer.py
 
 from typing import Dict, Any, List
-from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+import asyncio
 import uuid
 
 from app.models import Reference, CredibilityReport
@@ -13,6 +14,20 @@ from app.strategies.rag_strategy import RAGAnalysisStrategy
 from app.strategies.ai_strategy import AIAnalysisStrategy
 
 
+# One row per strategy, in report order:
+# (strategy class, label, red flag check on the result, red flag text, red flag on error)
+STRATEGY_META = (
+    (DomainAnalysisStrategy, "Domain", lambda r: r["score"] < 10,             # 30 points max
+     "Low domain reputation", "Domain analysis error"),
+    (MetadataAnalysisStrategy, "Metadata", lambda r: r["score"] < 5,          # 20 points max
+     "Poor metadata quality", "Metadata analysis error"),
+    (RAGAnalysisStrategy, "RAG", lambda r: r.get("details", {}).get("count", 0) == 0,  # 25 points max
+     "No corroborating sources found", "RAG analysis error"),
+    (AIAnalysisStrategy, "AI", lambda r: r["score"] < 10,                     # 25 points max
+     "AI flagged content quality concerns", "AI analysis error"),
+)
+
+
 class CredibilityAnalyzer:
     """
     Main orchestrator for credibility analysis.
@@ -30,13 +45,13 @@ class CredibilityAnalyzer:
         """
         self.db = db
         
-        # Initialize all analysis strategies
-        self.strategies = [
-            DomainAnalysisStrategy(db),      # 30 points max
-            MetadataAnalysisStrategy(db),    # 20 points max
-            RAGAnalysisStrategy(db),         # 25 points max
-            AIAnalysisStrategy(db)           # 25 points max
-        ]
+        # Strategies run concurrently in worker threads. A scoped session
+        # gives each thread its own Session, since one Session must never
+        # be shared across threads.
+        self.strategy_db = scoped_session(sessionmaker(bind=db.get_bind()))
+        
+        # Initialize all analysis strategies, in STRATEGY_META order
+        self.strategies = [strategy_cls(self.strategy_db) for strategy_cls, *_ in STRATEGY_META]
         
         # Total possible score: 100 points
         self.max_score = sum(strategy.max_score for strategy in self.strategies)
@@ -53,69 +68,86 @@ class CredibilityAnalyzer:
         Returns:
             CredibilityReport object with complete analysis
         """
-        # CRITICAL FIX: Delete any existing report first (for reanalysis)
-        existing_report = self.db.query(CredibilityReport).filter(
-            CredibilityReport.reference_id == reference.reference_id
-        ).first()
-        
-        if existing_report:
-            self.db.delete(existing_report)
-            self.db.commit()
-        
-        # Execute all strategies and store results
-        domain_result = {"score": 0, "explanation": "Not analyzed"}
-        metadata_result = {"score": 0, "explanation": "Not analyzed"}
-        rag_result = {"score": 0, "explanation": "Not analyzed"}
-        ai_result = {"score": 0, "explanation": "Not analyzed"}
-        red_flags = []
+        reports = await self.analyze_references([reference])
+        return reports[0]
+    
+    async def analyze_references(self, references: List[Reference]) -> List[CredibilityReport]:
+        """
+        Analyze several references and create one credibility report each.
         
-        # Run Domain Strategy
-        try:
-            domain_result = self.strategies[0].analyze(reference)
-            if domain_result["score"] < 10:
-                red_flags.append("Low domain reputation")
-        except Exception as e:
-            domain_result = {"score": 0, "explanation": f"Domain analysis failed: {str(e)}"}
-            red_flags.append("Domain analysis error")
-        
-        # Run Metadata Strategy
-        try:
-            metadata_result = self.strategies[1].analyze(reference)
-            if metadata_result["score"] < 5:
-                red_flags.append("Poor metadata quality")
-        except Exception as e:
-            metadata_result = {"score": 0, "explanation": f"Metadata analysis failed: {str(e)}"}
-            red_flags.append("Metadata analysis error")
-        
-        # Run RAG Strategy
-        try:
-            rag_result = self.strategies[2].analyze(reference)
-            if rag_result.get("details", {}).get("count", 0) == 0:
-                red_flags.append("No corroborating sources found")
-        except Exception as e:
-            rag_result = {"score": 0, "explanation": f"RAG analysis failed: {str(e)}"}
-            red_flags.append("RAG analysis error")
-        
-        # Run AI Strategy
-        try:
-            ai_result = self.strategies[3].analyze(reference)
-            if ai_result["score"] < 10:
-                red_flags.append("AI flagged content quality concerns")
-        except Exception as e:
-            ai_result = {"score": 0, "explanation": f"AI analysis failed: {str(e)}"}
-            red_flags.append("AI analysis error")
+        Each strategy receives the whole batch, so strategies that call
+        external APIs can share one request across references.
         
-        # Calculate total score
-        total_score = (
-            domain_result["score"] +
-            metadata_result["score"] +
-            rag_result["score"] +
-            ai_result["score"]
+        Args:
+            references: Reference objects to analyze
+            
+        Returns:
+            CredibilityReport objects, in input order
+        """
+        # CRITICAL FIX: Delete any existing reports first (for reanalysis).
+        # Not committed here: the delete, new reports and reference updates
+        # all land in the single commit below.
+        self.db.query(CredibilityReport).filter(
+            CredibilityReport.reference_id.in_([reference.reference_id for reference in references])
+        ).delete(synchronize_session=False)
+        
+        # Worker threads must not lazy-load through self.db; reload any
+        # attributes a commit has expired while still on this thread
+        for reference in references:
+            if inspect(reference).expired_attributes:
+                self.db.refresh(reference)
+        
+        # Execute all strategies concurrently; wall time is the slowest strategy
+        batch_results = await asyncio.gather(
+            *[asyncio.to_thread(self._run_strategy_batch, strategy, references) for strategy in self.strategies],
+            return_exceptions=True
         )
         
+        reports = []
+        for position, reference in enumerate(references):
+            # A strategy that failed as a whole fails for every reference
+            results = [
+                strategy_results if isinstance(strategy_results, Exception) else strategy_results[position]
+                for strategy_results in batch_results
+            ]
+            report = self._build_report(reference, results)
+            
+            # Save to database
+            self.db.add(report)
+            
+            # Update reference status and score
+            reference.status = ReferenceStatus.completed
+            reference.credibility_score = report.total_score
+            reports.append(report)
+        
+        self.db.commit()
+        for report in reports:
+            self.db.refresh(report)
+        
+        return reports
+    
+    def _build_report(self, reference: Reference, results: List[Any]) -> CredibilityReport:
+        """Turn one reference's strategy results (or exceptions) into a report."""
+        red_flags = []
+        strategy_results = []
+        for result, (_, label, is_flagged, flag, error_flag) in zip(results, STRATEGY_META):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                if is_flagged(result):
+                    red_flags.append(flag)
+            except Exception as e:
+                result = {"score": 0, "explanation": f"{label} analysis failed: {str(e)}"}
+                red_flags.append(error_flag)
+            strategy_results.append(result)
+        
+        domain_result, metadata_result, rag_result, ai_result = strategy_results
+        
+        # Calculate total score
+        total_score = sum(result["score"] for result in strategy_results)
+        
         # Create credibility report matching YOUR exact model structure
-        report = CredibilityReport(
-            report_id=uuid.uuid4(),
+        return CredibilityReport(
             reference_id=reference.reference_id,
             
             # Individual scores (matching your model exactly)
@@ -132,23 +164,15 @@ class CredibilityAnalyzer:
             ai_explanation=ai_result["explanation"],
             
             # Red flags
-            red_flags=red_flags,
-            
-            # Timestamp
-            created_at=datetime.utcnow()
+            red_flags=red_flags
         )
-        
-        # Save to database
-        self.db.add(report)
-        
-        # Update reference status and score
-        reference.status = ReferenceStatus.completed
-        reference.credibility_score = total_score
-        
-        self.db.commit()
-        self.db.refresh(report)
-        
-        return report
+    
+    def _run_strategy_batch(self, strategy, references: List[Reference]) -> List[Any]:
+        """Run one strategy over a batch in a worker thread, releasing its thread-local session."""
+        try:
+            return strategy.analyze_batch(references)
+        finally:
+            self.strategy_db.remove()
     
     def get_report_by_reference(self, reference_id: uuid.UUID) -> CredibilityReport:
         """
@@ -160,9 +184,10 @@ class CredibilityAnalyzer:
         Returns:
             CredibilityReport object or None
         """
-        return self.db.query(CredibilityReport).filter(
-            CredibilityReport.reference_id == reference_id
-        ).first()
+        # reference_id is unique, so at most one row matches
+        return self.db.scalars(
+            select(CredibilityReport).where(CredibilityReport.reference_id == reference_id)
+        ).one_or_none()
     
     async def reanalyze_reference(self, reference: Reference) -> CredibilityReport:
         """
@@ -0,0 +1,75 @@
+# File: backend/app/services/metadata_cache.py
+
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+from cachetools import TLRUCache
+
+from app.services.cache_service import CacheService
+
+
+# Scraped page metadata rarely changes; keep it for a day in Redis
+METADATA_CACHE_TTL = 86400
+
+# URLs that failed to scrape (timeouts, dead links) are retried after 10 minutes
+FAILED_SCRAPE_TTL = 600
+FAILED_KEY = "__failed__"
+
+# Per-process L1 in front of Redis for hot URLs
+L1_MAXSIZE = 1024
+L1_TTL = 3600
+
+
+def _l1_expiry(key: str, value: Dict[str, Any], now: float) -> float:
+    """Failed-scrape markers expire from L1 as soon as they do in Redis."""
+    return now + (FAILED_SCRAPE_TTL if value.get(FAILED_KEY) else L1_TTL)
+
+
+_l1: TLRUCache = TLRUCache(maxsize=L1_MAXSIZE, ttu=_l1_expiry)
+_l1_lock = threading.Lock()  # TLRUCache is not thread-safe
+
+
+def _url_key(url: str) -> str:
+    """Fixed-length cache key for a URL."""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+class MetadataCache:
+    """
+    Two-level URL -> scraped metadata cache.
+    
+    L1 is an in-process TTL cache; L2 is Redis (shared across API workers).
+    Failed scrapes are cached briefly as {FAILED_KEY: True} markers.
+    Like CacheService, failures only ever cost a cache miss.
+    """
+    
+    def __init__(self):
+        self.redis = CacheService(prefix="meta")
+    
+    async def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return cached metadata for url, or None on miss."""
+        key = _url_key(url)
+        
+        with _l1_lock:
+            value = _l1.get(key)
+        if value is not None:
+            return value
+        
+        value = await self.redis.get(key)
+        if value is not None:
+            with _l1_lock:
+                _l1[key] = value
+        return value
+    
+    async def set(self, url: str, metadata: Dict[str, Any], ttl: int = METADATA_CACHE_TTL) -> None:
+        """Cache metadata for url in both levels."""
+        key = _url_key(url)
+        
+        with _l1_lock:
+            _l1[key] = metadata
+        await self.redis.set(key, metadata, expire=ttl)
+    
+    async def set_failed(self, url: str, reason: str) -> None:
+        """Remember that url could not be scraped, so repeats skip the browser."""
+        await self.set(url, {FAILED_KEY: True, "reason": reason}, ttl=FAILED_SCRAPE_TTL)
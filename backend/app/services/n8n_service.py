@@ -1,9 +1,35 @@
 # File: backend/app/services/n8n_service.py
 
 import httpx
-import asyncio
+import logging
 from typing import Dict, Any, Optional
-from app.config import settings
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Process-wide client: keeps TLS sessions and HTTP/2 connections alive between webhooks
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared webhook client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            headers={"Content-Type": "application/json"}
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared webhook client (call on process shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 class N8NService:
@@ -11,6 +37,7 @@ class N8NService:
     
     def __init__(self):
         # Build full webhook URL from config
+        settings = get_settings()
         if settings.N8N_WEBHOOK_BASE_URL:
             self.webhook_url = settings.N8N_WEBHOOK_BASE_URL + settings.N8N_REFERENCE_WEBHOOK
             self.enabled = True
@@ -44,7 +71,7 @@ class N8NService:
             True if successful, False otherwise
         """
         if not self.enabled:
-            print("⚠️  N8N webhook not configured (N8N_WEBHOOK_BASE_URL not set)")
+            logger.warning("N8N webhook not configured (N8N_WEBHOOK_BASE_URL not set)")
             return False
         
         payload = {
@@ -58,24 +85,24 @@ class N8NService:
             "breakdown": breakdown
         }
         
+        log_fields = {"reference_id": reference_id, "event": "reference_analyzed"}
+        
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    self.webhook_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
+            response = await get_http_client().post(self.webhook_url, json=payload)
+            
+            if response.status_code == 200:
+                logger.info("N8N webhook success for reference %s", reference_id, extra=log_fields)
+                return True
+            else:
+                logger.warning(
+                    "N8N webhook returned %s", response.status_code,
+                    extra={**log_fields, "status_code": response.status_code}
                 )
-                
-                if response.status_code == 200:
-                    print(f"✅ N8N webhook success for reference {reference_id}")
-                    return True
-                else:
-                    print(f"⚠️  N8N webhook returned {response.status_code}")
-                    return False
+                return False
                     
         except httpx.TimeoutException:
-            print(f"⚠️  N8N webhook timeout")
+            logger.warning("N8N webhook timeout", extra=log_fields)
             return False
         except Exception as e:
-            print(f"❌ N8N webhook error: {e}")
-            return False
\ No newline at end of file
+            logger.error("N8N webhook error: %s", e, extra=log_fields)
+            return False
@@ -0,0 +1,143 @@
+# File: backend/app/services/proximity_cache.py
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+import numpy as np
+
+
+# Set bits per byte value, for Hamming distance between packed signatures
+_POPCOUNT8 = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+class ProximityCache:
+    """
+    Approximate embedding -> value cache.
+
+    A lookup hits when some cached embedding lies within cosine distance
+    tau of the query, so near-duplicate queries (re-checks of the same
+    title) reuse the earlier result. Eviction is LRU.
+
+    Each entry also gets a random-projection (SimHash) signature. A lookup
+    first compares signatures by Hamming distance (a few bytes per entry)
+    and runs the full cosine check only on entries whose signature is
+    close enough to possibly be within tau.
+    """
+
+    def __init__(self, max_size: int, tau: float, dim: Optional[int] = None, lsh_bits: int = 64):
+        """
+        Args:
+            max_size: Maximum number of cached embeddings (0 disables the cache)
+            tau: Maximum cosine distance for a hit
+            dim: Embedding dimension; by default taken from the first cached
+                embedding, so any configured EMBEDDING_MODEL works
+            lsh_bits: Signature length in bits (multiple of 8)
+        """
+        self.max_size = max_size
+        self.tau = tau
+        self.lsh_bits = lsh_bits
+        self.dim: Optional[int] = None
+        self._matrix: Optional[np.ndarray] = None
+        self._planes: Optional[np.ndarray] = None
+        self._signatures = np.zeros((max_size, lsh_bits // 8), dtype=np.uint8)
+        self._max_hamming = self._hamming_threshold(tau, lsh_bits)
+        self._values: List[Any] = [None] * max_size
+        self._rows: "OrderedDict[bytes, int]" = OrderedDict()  # key -> row, oldest first
+        self._row_keys: List[Optional[bytes]] = [None] * max_size
+        self._lock = threading.Lock()  # strategies run in worker threads
+        if dim is not None:
+            self._allocate(dim)
+
+    def _allocate(self, dim: int) -> None:
+        """Size the embedding matrix and signature hyperplanes for dim."""
+        self.dim = dim
+        self._matrix = np.zeros((self.max_size, dim), dtype=np.float32)
+        # Fixed seed: signatures must not change between lookups
+        self._planes = np.random.default_rng(0).standard_normal((self.lsh_bits, dim)).astype(np.float32)
+
+    def get(self, embedding: np.ndarray) -> Optional[Any]:
+        """Return the value cached for the nearest embedding within tau, or None."""
+        if not self._rows:
+            return None
+
+        query = self._normalize(embedding)
+        with self._lock:
+            candidates = self._candidates(query)
+            if candidates.size == 0:
+                return None
+
+            similarities = self._matrix[candidates] @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] < 1.0 - self.tau:
+                return None
+            row = int(candidates[best])
+            self._rows.move_to_end(self._row_keys[row])
+            return self._values[row]
+
+    def _candidates(self, query: np.ndarray) -> np.ndarray:
+        """
+        Rows whose signature is within the Hamming threshold of query's.
+
+        Only these get the full cosine check. Caller holds the lock.
+        """
+        used = len(self._rows)
+        distances = _POPCOUNT8[self._signatures[:used] ^ self._signature(query)].sum(axis=1)
+        return np.flatnonzero(distances <= self._max_hamming)
+
+    def set(self, embedding: np.ndarray, value: Any) -> None:
+        """Cache value under embedding, evicting the least recently used entry if full."""
+        if self.max_size <= 0:
+            return
+
+        query = self._normalize(embedding)
+        key = query.tobytes()
+        with self._lock:
+            if self._matrix is None:
+                self._allocate(query.shape[0])
+            row = self._rows.get(key)
+            if row is not None:
+                self._rows.move_to_end(key)
+            else:
+                if len(self._rows) < self.max_size:
+                    # Rows fill in order until the first eviction
+                    row = len(self._rows)
+                else:
+                    _, row = self._rows.popitem(last=False)
+                self._rows[key] = row
+                self._row_keys[row] = key
+                self._matrix[row] = query
+                self._signatures[row] = self._signature(query)
+            self._values[row] = value
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._rows.clear()
+            self._row_keys = [None] * self.max_size
+            self._values = [None] * self.max_size
+
+    def _signature(self, vector: np.ndarray) -> np.ndarray:
+        """Packed sign bits of the random projections of vector."""
+        return np.packbits(self._planes @ vector > 0)
+
+    @staticmethod
+    def _hamming_threshold(tau: float, bits: int) -> int:
+        """
+        Largest signature distance still worth a cosine check.
+
+        Each bit differs with probability angle/pi; allow the expected
+        number of differing bits at cosine distance tau plus three
+        standard deviations, so true hits are almost never filtered out.
+        """
+        angle = math.acos(max(-1.0, min(1.0, 1.0 - tau)))
+        p = angle / math.pi
+        return math.ceil(bits * p + 3 * math.sqrt(bits * p * (1 - p)))
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        """Unit-length float32 copy of embedding."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
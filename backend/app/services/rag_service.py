@@ -1,13 +1,145 @@
 # File: backend/app/services/rag_service.py
 
-from typing import List, Dict, Any
-import json
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from sentence_transformers import SentenceTransformer
-from sqlalchemy import select
+from sqlalchemy import func, insert, select
 from app.models import RAGSource
-from app.config import settings
+from app.config import get_settings
+
+if TYPE_CHECKING:
+    # torch and sentence-transformers are imported only when the model
+    # loads, so processes that never embed (the API) don't pay for them
+    from sentence_transformers import SentenceTransformer
+
+
+# Longest input (in tokens) the embedding model will see; longer text is truncated
+EMBEDDING_MAX_SEQ_LENGTH = 256
+ENCODE_BATCH_SIZE = 32
+
+# Characters of content_text returned with each similar source
+CONTENT_PREVIEW_CHARS = 200
+
+# Query embeddings kept per process (~1.5 KB each at 384 dims)
+EMBEDDING_CACHE_SIZE = 4096
+
+# Rows per INSERT statement when bulk-loading sources
+BULK_INSERT_BATCH_SIZE = 1000
+
+# Shared across RAGService instances so the model loads once per process
+_model: Optional["SentenceTransformer"] = None
+_model_lock = threading.Lock()
+
+
+def get_embedding_model() -> "SentenceTransformer":
+    """
+    Return the process-wide embedding model, loading it on first use.
+    
+    Double-checked locking: analyzer strategies run in worker threads, and
+    only one of them may pay for loading the weights.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                import torch
+                from sentence_transformers import SentenceTransformer
+                
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+                model = SentenceTransformer(get_settings().EMBEDDING_MODEL, device=device)
+                model.max_seq_length = EMBEDDING_MAX_SEQ_LENGTH
+                _model = model
+    return _model
+
+
+def warm_up_embedding_model() -> None:
+    """Load the model and run one forward pass so the first real query is not slow."""
+    get_embedding_model().encode("warmup", convert_to_numpy=True, show_progress_bar=False)
+
+
+_embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+
+def _encode_cached(texts: List[str]) -> List[np.ndarray]:
+    """
+    Embed texts through the process-wide LRU cache.
+    
+    Cached texts skip the model entirely; the misses (deduplicated) go
+    through one batched forward pass and are stored for the next caller.
+    The lock is not held while encoding, so two threads may occasionally
+    encode the same text; the second result simply overwrites the first.
+    
+    Args:
+        texts: Query texts
+        
+    Returns:
+        Read-only normalized float32 vectors (shared between callers), in input order
+    """
+    found: Dict[str, np.ndarray] = {}
+    with _embedding_cache_lock:
+        for text in texts:
+            embedding = _embedding_cache.get(text)
+            if embedding is not None:
+                _embedding_cache.move_to_end(text)
+                found[text] = embedding
+    
+    misses = [text for text in dict.fromkeys(texts) if text not in found]
+    if misses:
+        encoded = get_embedding_model().encode(
+            misses,
+            batch_size=ENCODE_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        with _embedding_cache_lock:
+            for text, row in zip(misses, encoded):
+                # Copy so an evicted entry doesn't pin the whole batch array
+                embedding = row.astype(np.float32, copy=True)
+                embedding.flags.writeable = False
+                _embedding_cache[text] = embedding
+                _embedding_cache.move_to_end(text)
+                found[text] = embedding
+            while len(_embedding_cache) > EMBEDDING_CACHE_SIZE:
+                _embedding_cache.popitem(last=False)
+    
+    return [found[text] for text in texts]
+
+
+def bulk_insert_sources(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    Insert many RAG sources in a few multi-row INSERT statements.
+    
+    Goes through Core insert() executemany, which SQLAlchemy batches into
+    multi-VALUES statements instead of one round-trip per ORM object.
+    Embeddings are scaled to unit length on the way in; the similarity
+    search relies on that (inner product == cosine).
+    
+    Args:
+        db: SQLAlchemy database session
+        rows: Column dictionaries for RAGSource (url, title, embedding_vector, ...)
+        
+    Returns:
+        Number of rows inserted
+    """
+    for row in rows:
+        if row.get("embedding_vector") is not None:
+            row["embedding_vector"] = _normalize(row["embedding_vector"])
+    
+    for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+        db.execute(insert(RAGSource), rows[start:start + BULK_INSERT_BATCH_SIZE])
+    db.commit()
+    return len(rows)
+
+
+def _normalize(embedding: Any) -> np.ndarray:
+    """Unit-length float32 copy of an embedding."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
 
 
 class RAGService:
@@ -20,25 +152,48 @@ class RAGService:
     
     def __init__(self, db: Session):
         """
-        Initialize RAG service with database session and embedding model.
+        Initialize RAG service with database session.
         
         Args:
             db: SQLAlchemy database session
         """
         self.db = db
-        self._model = None
     
     @property
-    def model(self) -> SentenceTransformer:
+    def model(self) -> "SentenceTransformer":
         """
         Lazy-load the embedding model (only load when needed).
         
         Returns:
             SentenceTransformer model
         """
-        if self._model is None:
-            self._model = SentenceTransformer(settings.EMBEDDING_MODEL)
-        return self._model
+        return get_embedding_model()
+    
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Embed a query text (memoized per process).
+        
+        Args:
+            text: Query text
+            
+        Returns:
+            Read-only normalized float32 vector
+        """
+        return _encode_cached([text])[0]
+    
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed many query texts, encoding only those not already cached.
+        
+        Args:
+            texts: Query texts
+            
+        Returns:
+            (len(texts), dim) array of normalized float32 vectors
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack(_encode_cached(texts))
     
     def find_similar_sources(
         self, 
@@ -57,91 +212,147 @@ class RAGService:
         Returns:
             List of dictionaries containing similar sources with similarity scores
         """
-        # Generate embedding for query
-        query_embedding = self.model.encode(query_text).tolist()
+        return self._search(self.embed(query_text), top_k, min_similarity)
+    
+    def find_similar_sources_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        min_similarity: float = 0.5
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Find similar sources for many queries with a single batched encode.
+        
+        Args:
+            queries: Texts to search for similar sources
+            top_k: Number of top results to return per query
+            min_similarity: Minimum similarity threshold (0-1)
+            
+        Returns:
+            One list of similar sources per query, in input order
+        """
+        if not queries:
+            return []
+        
+        return [self._search(embedding, top_k, min_similarity) for embedding in self.embed_batch(queries)]
+    
+    def _search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+        min_similarity: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the pgvector nearest-neighbour query for one embedding.
+        
+        Args:
+            query_embedding: Normalized query vector (required for inner product ranking)
+            top_k: Number of top results to return
+            min_similarity: Minimum similarity threshold (0-1)
+            
+        Returns:
+            List of dictionaries containing similar sources with similarity scores
+        """
+        # Match the halfvec column so the index comparison stays in fp16
+        query_embedding = query_embedding.astype(np.float16)
+        distance = RAGSource.embedding_vector.max_inner_product(query_embedding)
 
         stmt = (
             select(
                 RAGSource.source_id,
                 RAGSource.url,
                 RAGSource.title,
-                RAGSource.content_text,
+                # Only the preview leaves the database, not the whole text
+                func.substr(RAGSource.content_text, 1, CONTENT_PREVIEW_CHARS).label("content_preview"),
                 RAGSource.domain,
                 RAGSource.credibility_score,
-                (1 - RAGSource.embedding_vector.cosine_distance(query_embedding)).label("similarity"),
+                # <#> is the negated inner product; both sides are unit length,
+                # so its negation is the cosine similarity
+                (-distance).label("similarity"),
             )
             .where(RAGSource.embedding_vector.isnot(None))
-            .order_by(RAGSource.embedding_vector.cosine_distance(query_embedding))
+            # Threshold applied in the database: weak matches never leave it
+            .where(distance <= -min_similarity)
+            .order_by(distance)
             .limit(top_k)
         )
 
+        # hnsw.ef_search is left at pgvector's default (40); raise it on the
+        # role or database if recall on the HNSW index needs to go up
         rows = self.db.execute(stmt).all()
 
-        similar_sources = []
-        for row in rows:
-            if row.similarity >= min_similarity:
-                similar_sources.append({
-                    "source_id": str(row.source_id),
-                    "url": row.url,
-                    "title": row.title,
-                    "content_text": row.content_text[:200] + "..." if row.content_text else None,
-                    "domain": row.domain,
-                    "credibility_score": row.credibility_score,
-                    "similarity": round(float(row.similarity), 3),
-                })
-
-        return similar_sources
+        return [
+            {
+                "source_id": str(row.source_id),
+                "url": row.url,
+                "title": row.title,
+                "content_text": row.content_preview + "..." if row.content_preview else None,
+                "domain": row.domain,
+                "credibility_score": row.credibility_score,
+                "similarity": round(float(row.similarity), 3),
+            }
+            for row in rows
+        ]
 
-    
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
+    def analyze_cross_references(
+        self, 
+        reference_text: str,
+        top_k: int = 5
+    ) -> Dict[str, Any]:
         """
-        Calculate cosine similarity between two vectors.
+        Analyze cross-references for a given reference text.
         
         Args:
-            vec1: First vector
-            vec2: Second vector
+            reference_text: Text to analyze (title + abstract)
+            top_k: Number of similar sources to find
             
         Returns:
-            Similarity score between 0 and 1
+            Dictionary with similar sources and analysis
         """
-        # Ensure same length
-        if len(vec1) != len(vec2):
-            return 0.0
-        
-        # Calculate dot product
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        
-        # Calculate magnitudes
-        magnitude1 = sum(a * a for a in vec1) ** 0.5
-        magnitude2 = sum(b * b for b in vec2) ** 0.5
-        
-        # Avoid division by zero
-        if magnitude1 == 0 or magnitude2 == 0:
-            return 0.0
-        
-        # Cosine similarity
-        similarity = dot_product / (magnitude1 * magnitude2)
-        
-        # Clamp to [0, 1] range
-        return max(0.0, min(1.0, similarity))
+        return self.analyze_embedding(self.embed(reference_text), top_k=top_k)
     
-    def analyze_cross_references(
-        self, 
-        reference_text: str,
-        top_k: int = 5
+    def analyze_embedding(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int = 5,
+        min_similarity: float = 0.5
     ) -> Dict[str, Any]:
         """
-        Analyze cross-references for a given reference text.
+        Analyze cross-references for an already computed query embedding.
         
         Args:
-            reference_text: Text to analyze (title + abstract)
+            query_embedding: Normalized query vector (see embed())
             top_k: Number of similar sources to find
+            min_similarity: Minimum similarity threshold (0-1)
             
         Returns:
             Dictionary with similar sources and analysis
         """
-        similar_sources = self.find_similar_sources(reference_text, top_k=top_k)
+        return self._summarize(self._search(query_embedding, top_k, min_similarity))
+    
+    def analyze_cross_references_batch(
+        self,
+        reference_texts: List[str],
+        top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze cross-references for many reference texts at once.
         
+        All texts share one transformer forward pass; the vector search
+        still runs once per text.
+        
+        Args:
+            reference_texts: Texts to analyze (title + abstract)
+            top_k: Number of similar sources to find per text
+            
+        Returns:
+            One analysis dictionary per text, in input order
+        """
+        results = self.find_similar_sources_batch(reference_texts, top_k=top_k)
+        return [self._summarize(similar_sources) for similar_sources in results]
+    
+    def _summarize(self, similar_sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summarize similar sources into a cross-reference analysis."""
         if not similar_sources:
             return {
                 "similar_sources": [],
@@ -157,4 +368,4 @@ class RAGService:
             "count": len(similar_sources),
             "average_similarity": round(avg_similarity, 3),
             "has_corroboration": len(similar_sources) >= 3 and avg_similarity >= 0.6
-        }
\ No newline at end of file
+        }
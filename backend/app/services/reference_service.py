@@ -1,49 +1,121 @@
 # File: backend/app/services/reference_service.py
 
-from sqlalchemy.orm import Session
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List
+from sqlalchemy.ext.asyncio import AsyncSession
 from urllib.parse import urlparse
 from uuid import UUID
-from datetime import datetime
 
 from app.models import Reference, ReferenceStatus
-from app.services.scraper_service import WebScraperService
+from app.services.metadata_cache import FAILED_KEY, MetadataCache
+from app.services.scraper_service import SCRAPER_POOL_SIZE, WebScraperService
+from app.utils.dates import parse_ymd
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def _domain_of(url: str) -> str:
+    """Domain of a URL without a leading www. (resubmitted URLs hit the cache)."""
+    return urlparse(url).netloc.removeprefix("www.")
 
 
 class ReferenceService:
     """Service for managing references."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.scraper = WebScraperService()
+        self.metadata_cache = MetadataCache()
     
     async def create_reference(self, url: str, user_id: UUID) -> Reference:
         """
         Create a new reference for analysis.
         Extracts domain and scrapes metadata (title, author, date).
         """
-        # Extract domain from URL
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.replace("www.", "")
+        metadata = await self._get_metadata(url)
+        reference = self._build_reference(url, user_id, metadata)
+        
+        # eager_defaults returns generated columns on INSERT, so no refresh SELECT
+        self.db.add(reference)
+        await self.db.commit()
+        
+        return reference
+    
+    async def create_references(self, urls: List[str], user_id: UUID) -> List[Reference]:
+        """
+        Create many references at once.
+        
+        Scrapes run concurrently (bounded by the scraper pool size), then
+        all rows are inserted in a single commit. Generated columns come
+        back via RETURNING (eager_defaults), so no per-row refresh is needed.
+        
+        Args:
+            urls: URLs to create references for
+            user_id: Owner of the new references
+            
+        Returns:
+            New references, in input order
+        """
+        semaphore = asyncio.Semaphore(SCRAPER_POOL_SIZE)
+        
+        async def fetch(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._get_metadata(url)
+        
+        all_metadata = await asyncio.gather(*[fetch(url) for url in urls])
+        references = [
+            self._build_reference(url, user_id, metadata)
+            for url, metadata in zip(urls, all_metadata)
+        ]
+        
+        self.db.add_all(references)
+        await self.db.commit()
+        
+        return references
+    
+    async def _get_metadata(self, url: str) -> Dict[str, Any]:
+        """Return scraped metadata for url, from the cache when possible."""
+        empty_metadata = {'title': None, 'author': None, 'publication_date': None}
+        metadata = await self.metadata_cache.get(url)
+        
+        if metadata is not None and metadata.get(FAILED_KEY):
+            # Recently failed (dead link, timeout): don't pay the browser timeout again
+            return empty_metadata
+        if metadata is not None:
+            return metadata
         
-        # Scrape metadata from URL (run in thread pool to avoid blocking)
         try:
-            import asyncio
-            loop = asyncio.get_event_loop()
-            metadata = await loop.run_in_executor(None, self.scraper.scrape_metadata, url)
+            # Static HTML first; the browser only for pages that need JavaScript
+            metadata = await self.scraper.scrape_static(url)
+            if metadata is None:
+                # Rendered on the shared browser, directly on the event loop
+                metadata = await self.scraper.scrape_metadata(url, raise_errors=True)
         except Exception as e:
-            print(f"Scraping failed for {url}: {str(e)}")
-            metadata = {'title': None, 'author': None, 'publication_date': None}
+            logger.warning("Scraping failed for %s: %s", url, e)
+            await self.metadata_cache.set_failed(url, str(e))
+            return empty_metadata
+        
+        await self.metadata_cache.set(url, metadata)
+        return metadata
+    
+    def _build_reference(self, url: str, user_id: UUID, metadata: Dict[str, Any]) -> Reference:
+        """Build an unsaved Reference from a URL and its scraped metadata."""
+        # Extract domain from URL
+        domain = _domain_of(url)
         
         # Parse publication date
         pub_date = None
         if metadata.get('publication_date'):
             try:
-                pub_date = datetime.strptime(metadata['publication_date'], '%Y-%m-%d').date()
+                pub_date = parse_ymd(metadata['publication_date'])
             except ValueError:
                 pass
         
         # Create reference with scraped metadata
-        reference = Reference(
+        return Reference(
             user_id=user_id,
             url=url,
             domain=domain,
@@ -52,20 +124,12 @@ class ReferenceService:
             publication_date=pub_date,
             status=ReferenceStatus.processing
         )
-        
-        self.db.add(reference)
-        self.db.commit()
-        self.db.refresh(reference)
-        
-        return reference
     
-    def get_reference(self, reference_id: UUID) -> Reference:
-        """Get a reference by ID."""
-        return self.db.query(Reference).filter(
-            Reference.reference_id == reference_id
-        ).first()
+    async def get_reference(self, reference_id: UUID) -> Reference:
+        """Get a reference by ID (identity map first, then a primary key SELECT)."""
+        return await self.db.get(Reference, reference_id)
     
-    def update_reference_metadata(
+    async def update_reference_metadata(
         self,
         reference_id: UUID,
         title: str = None,
@@ -73,7 +137,7 @@ class ReferenceService:
         publication_date = None
     ) -> Reference:
         """Update reference metadata."""
-        reference = self.get_reference(reference_id)
+        reference = await self.get_reference(reference_id)
         
         if not reference:
             return None
@@ -85,7 +149,7 @@ class ReferenceService:
         if publication_date:
             reference.publication_date = publication_date
         
-        self.db.commit()
-        self.db.refresh(reference)
+        # updated_at comes back via RETURNING; the in-session object is current
+        await self.db.commit()
         
         return reference
\ No newline at end of file
@@ -1,80 +1,327 @@
 # File: backend/app/services/scraper_service.py
 
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
-from bs4 import BeautifulSoup
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Playwright,
+    Route,
+    async_playwright,
+    TimeoutError as PlaywrightTimeout,
+)
+import httpx
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime
+from dateutil import parser as dateutil_parser
+import asyncio
+import logging
 import re
 from typing import Optional, Dict
 
+logger = logging.getLogger(__name__)
+
+
+# libxml2-backed parser when available; the pure-Python one is several times slower
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Site-name suffix on <title> ("Paper title | Nature") and byline prefixes
+_TITLE_SUFFIX_RE = re.compile(r'\s*[\|\-]\s*(Nature|arXiv|Science|PLOS|.*)\s*$')
+_BYLINE_PREFIX_RE = re.compile(r'^(By|Written by|Author:)\s*', re.IGNORECASE)
+
+# Fills in fields a date string leaves out (year-only or month-only dates).
+# Parsed twice with different default years: if the year follows the
+# default, the string had no year ("June 5", "10:30") and is rejected.
+_DATE_DEFAULT = datetime(1900, 1, 1)
+_DATE_DEFAULT_ALT = datetime(1901, 1, 1)
+
+# Tags the extractors read; everything else (scripts, body text, layout) is skipped
+_METADATA_TAGS = frozenset({'meta', 'title', 'time', 'h1'})
+AUTHOR_CLASSES = ('author', 'byline', 'article-author', 'post-author', 'author-name')
+
+
+def _is_metadata_tag(name: str, attrs: dict) -> bool:
+    """SoupStrainer filter: keep only elements _extract_* can match."""
+    if name in _METADATA_TAGS:
+        return True
+    if name == 'a' and attrs.get('data-test') == 'author-name':
+        return True
+    classes = attrs.get('class')
+    if not classes:
+        return False
+    if isinstance(classes, str):
+        classes = classes.split()
+    return any(class_name in AUTHOR_CLASSES for class_name in classes)
+
+
+METADATA_STRAINER = SoupStrainer(_is_metadata_tag)
+
+# Max concurrent page renders per process (pages share one browser)
+SCRAPER_POOL_SIZE = 4
+
+# Subresources that never carry metadata. Scripts stay allowed: pages only
+# reach the browser when their metadata is rendered client-side.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+# How long to wait for <head> before serializing the whole page instead (ms)
+HEAD_LOCATOR_TIMEOUT = 1500
+
+
+async def _block_heavy_resources(route: Route) -> None:
+    """Abort downloads the metadata extractors never look at."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class BrowserPool:
+    """
+    One long-lived Chromium per event loop, shared by concurrent scrapes.
+    
+    Async Playwright objects belong to the loop that created them, so the
+    pool starts over if it is used from a different loop. A semaphore caps
+    the number of pages rendering at once.
+    """
+    
+    def __init__(self, size: int = SCRAPER_POOL_SIZE):
+        self.size = size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._context: Optional[BrowserContext] = None
+    
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.size)
+            self._playwright = self._browser = self._context = None
+    
+    def slot(self) -> asyncio.Semaphore:
+        """Semaphore a scrape must hold while it has a page open."""
+        self._bind_loop()
+        return self._semaphore
+    
+    async def get_context(self) -> BrowserContext:
+        """Return the shared context, launching the browser on first use or after a crash."""
+        self._bind_loop()
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(
+                    headless=True,
+                    args=["--disable-dev-shm-usage", "--no-sandbox"]
+                )
+                self._context = await self._browser.new_context()
+                await self._context.route("**/*", _block_heavy_resources)
+        return self._context
+    
+    async def close(self) -> None:
+        """Shut down the browser and Playwright driver (call on process shutdown)."""
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self._loop = None
+        self._playwright = self._browser = self._context = None
+
+
+browser_pool = BrowserPool()
+
+
+# Plain HTTP fast path: most publisher landing pages carry their metadata in static HTML
+STATIC_FETCH_TIMEOUT = 5.0
+STATIC_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+}
+
+# Statuses that mean the page does not exist; anything else non-2xx may just be bot blocking
+_DEAD_STATUSES = frozenset({404, 410})
+
+# Process-wide client so TCP/TLS connections are reused between scrapes
+_static_client: Optional[httpx.AsyncClient] = None
+
+
+def get_static_client() -> httpx.AsyncClient:
+    """Return the shared static-fetch client, creating it on first use."""
+    global _static_client
+    if _static_client is None or _static_client.is_closed:
+        _static_client = httpx.AsyncClient(
+            timeout=STATIC_FETCH_TIMEOUT,
+            http2=True,
+            follow_redirects=True,
+            headers=STATIC_HEADERS,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+    return _static_client
+
+
+async def close_static_client() -> None:
+    """Close the shared static-fetch client (call on process shutdown)."""
+    global _static_client
+    if _static_client is not None:
+        await _static_client.aclose()
+        _static_client = None
+
+
+class ScrapeError(Exception):
+    """Raised when a page cannot be fetched (timeout, network error, HTTP error status)."""
+
 
 class WebScraperService:
-    """Service for scraping metadata from web pages using Playwright."""
+    """
+    Service for scraping metadata from web pages.
+    
+    scrape_static() tries a plain HTTP GET first; scrape_metadata() renders
+    the page in Playwright for sites that need JavaScript.
+    """
     
     def __init__(self):
         self.timeout = 10000  # 10 seconds
     
-    def scrape_metadata(self, url: str) -> Dict[str, Optional[str]]:
+    async def scrape_metadata(self, url: str, raise_errors: bool = False) -> Dict[str, Optional[str]]:
         """
         Scrape title, author, and publication date from a URL.
         
         Args:
             url: URL to scrape
+            raise_errors: Raise ScrapeError on failure instead of returning empty metadata
             
         Returns:
             Dictionary with title, author, publication_date
         """
         try:
-            with sync_playwright() as p:
-                # Launch browser
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                
-                # Navigate to URL
-                page.goto(url, timeout=self.timeout, wait_until='domcontentloaded')
-                
-                # Get page content
-                content = page.content()
-                browser.close()
-                
-                # Parse with BeautifulSoup
-                soup = BeautifulSoup(content, 'html.parser')
-                
-                # Extract metadata
-                metadata = {
-                    'title': self._extract_title(soup, url),
-                    'author': self._extract_author(soup),
-                    'publication_date': self._extract_date(soup)
-                }
-                
-                return metadata
+            async with browser_pool.slot():
+                # Shared context (routing already installed); only the page is per scrape
+                context = await browser_pool.get_context()
+                page = await context.new_page()
+                try:
+                    # Navigate to URL
+                    response = await page.goto(url, timeout=self.timeout, wait_until='domcontentloaded')
+                    if response is not None and response.status >= 400:
+                        raise ScrapeError(f"HTTP {response.status}")
+                    
+                    # Most metadata lives in <head>; serializing only that skips
+                    # the (often megabyte-sized) rendered body
+                    try:
+                        head = await page.locator('head').inner_html(timeout=HEAD_LOCATOR_TIMEOUT)
+                    except PlaywrightTimeout:
+                        head = None
+                    
+                    if head is not None:
+                        # Parsing is CPU work; keep it off the event loop
+                        metadata = await asyncio.to_thread(self._parse_metadata, f"<head>{head}</head>", url)
+                        if all(metadata.values()):
+                            return metadata
+                    
+                    # Body fallbacks (h1, <time>, byline classes) need the full page
+                    content = await page.content()
+                finally:
+                    await page.close()
+            
+            return await asyncio.to_thread(self._parse_metadata, content, url)
                 
-        except PlaywrightTimeout:
-            print(f"Timeout scraping {url}")
+        except PlaywrightTimeout as e:
+            logger.warning("Timeout scraping %s", url)
+            if raise_errors:
+                raise ScrapeError("timeout") from e
+            return self._fallback_metadata(url)
+        except ScrapeError as e:
+            logger.warning("Error scraping %s: %s", url, e)
+            if raise_errors:
+                raise
             return self._fallback_metadata(url)
         except Exception as e:
-            print(f"Error scraping {url}: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            # Unexpected failure: keep the traceback
+            logger.exception("Error scraping %s: %s", url, e)
+            if raise_errors:
+                raise ScrapeError(str(e)) from e
             return self._fallback_metadata(url)
     
-    def _extract_title(self, soup: BeautifulSoup, url: str) -> Optional[str]:
-        """Extract title from page."""
-        # Try Open Graph tag
-        og_title = soup.find('meta', property='og:title')
-        if og_title and og_title.get('content'):
-            return og_title['content'].strip()
+    async def scrape_static(self, url: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Try to read metadata from the raw HTML, without a browser.
         
-        # Try Twitter card
-        twitter_title = soup.find('meta', attrs={'name': 'twitter:title'})
-        if twitter_title and twitter_title.get('content'):
-            return twitter_title['content'].strip()
+        Args:
+            url: URL to scrape
+            
+        Returns:
+            Metadata if the static page had a title or date, otherwise None
+            (the caller should fall back to scrape_metadata)
+            
+        Raises:
+            ScrapeError: The server says the page does not exist
+        """
+        try:
+            response = await get_static_client().get(url)
+        except httpx.HTTPError:
+            return None
+        
+        if response.status_code in _DEAD_STATUSES:
+            raise ScrapeError(f"HTTP {response.status_code}")
+        if response.status_code >= 400 or "html" not in response.headers.get("content-type", ""):
+            return None
+        
+        # Parsing is CPU work; keep it off the event loop
+        metadata = await asyncio.to_thread(self._parse_metadata, response.text, url)
+        if metadata['title'] or metadata['publication_date']:
+            return metadata
+        return None
+    
+    def _parse_metadata(self, content: str, url: str) -> Dict[str, Optional[str]]:
+        """Extract title, author and publication date from page HTML."""
+        # Parse with BeautifulSoup
+        soup = BeautifulSoup(content, HTML_PARSER, parse_only=METADATA_STRAINER)
+        
+        # One pass over <meta> tags serves all three extractors
+        meta = self._index_meta(soup)
+        
+        # Extract metadata
+        return {
+            'title': self._extract_title(soup, url, meta),
+            'author': self._extract_author(soup, meta),
+            'publication_date': self._extract_date(soup, meta)
+        }
+    
+    def _index_meta(self, soup: BeautifulSoup) -> Dict[str, str]:
+        """
+        Map each meta property/name (lowercased) to its first non-empty content.
+        
+        Args:
+            soup: Parsed page
+            
+        Returns:
+            Dictionary of meta key -> content
+        """
+        index = {}
+        for tag in soup.find_all('meta'):
+            key = tag.get('property') or tag.get('name')
+            content = tag.get('content')
+            if key and content:
+                index.setdefault(key.lower(), content)
+        return index
+    
+    def _extract_title(self, soup: BeautifulSoup, url: str, meta: Dict[str, str]) -> Optional[str]:
+        """Extract title from page."""
+        # Try Open Graph tag, then Twitter card
+        for meta_name in ('og:title', 'twitter:title'):
+            if meta_name in meta:
+                return meta[meta_name].strip()
         
         # Try standard title tag
         title_tag = soup.find('title')
         if title_tag and title_tag.string:
             title = title_tag.string.strip()
             # Clean up common suffixes
-            title = re.sub(r'\s*[\|\-]\s*(Nature|arXiv|Science|PLOS|.*)\s*$', '', title)
+            title = _TITLE_SUFFIX_RE.sub('', title)
             return title
         
         # Try h1 as fallback
@@ -84,22 +331,12 @@ class WebScraperService:
         
         return None
     
-    def _extract_author(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_author(self, soup: BeautifulSoup, meta: Dict[str, str]) -> Optional[str]:
         """Extract author from page."""
-        # Try meta author tag
-        meta_author = soup.find('meta', attrs={'name': 'author'})
-        if meta_author and meta_author.get('content'):
-            return meta_author['content'].strip()
-        
-        # Try DC.creator (Dublin Core)
-        dc_creator = soup.find('meta', attrs={'name': 'DC.creator'})
-        if dc_creator and dc_creator.get('content'):
-            return dc_creator['content'].strip()
-        
-        # Try citation_author (common in academic papers)
-        citation_author = soup.find('meta', attrs={'name': 'citation_author'})
-        if citation_author and citation_author.get('content'):
-            return citation_author['content'].strip()
+        # Try meta author, DC.creator (Dublin Core), citation_author (academic papers)
+        for meta_name in ('author', 'dc.creator', 'citation_author'):
+            if meta_name in meta:
+                return meta[meta_name].strip()
         
         # Try data-test attribute (Nature, Science journals)
         author_data_test = soup.find('a', attrs={'data-test': 'author-name'})
@@ -107,44 +344,32 @@ class WebScraperService:
             return author_data_test.get_text().strip()
         
         # Try common class names
-        author_classes = ['author', 'byline', 'article-author', 'post-author', 'author-name']
-        for class_name in author_classes:
+        for class_name in AUTHOR_CLASSES:
             author_elem = soup.find(class_=class_name)
             if author_elem:
                 author_text = author_elem.get_text().strip()
                 # Clean common prefixes
-                author_text = re.sub(r'^(By|Written by|Author:)\s*', '', author_text, flags=re.IGNORECASE)
+                author_text = _BYLINE_PREFIX_RE.sub('', author_text)
                 if author_text and len(author_text) < 100:  # Sanity check
                     return author_text
         
         return None
     
-    def _extract_date(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_date(self, soup: BeautifulSoup, meta: Dict[str, str]) -> Optional[str]:
         """Extract publication date from page."""
-        # Try meta tags first
+        # Try meta tags first (property or name attribute)
         date_meta_names = [
             'article:published_time',
             'citation_publication_date',
-            'DC.date',
+            'dc.date',
             'date',
             'publish_date',
             'publication_date'
         ]
         
         for meta_name in date_meta_names:
-            # Try property attribute
-            date_tag = soup.find('meta', property=meta_name)
-            if date_tag and date_tag.get('content'):
-                date_str = date_tag['content']
-                parsed_date = self._parse_date(date_str)
-                if parsed_date:
-                    return parsed_date
-            
-            # Try name attribute
-            date_tag = soup.find('meta', attrs={'name': meta_name})
-            if date_tag and date_tag.get('content'):
-                date_str = date_tag['content']
-                parsed_date = self._parse_date(date_str)
+            if meta_name in meta:
+                parsed_date = self._parse_date(meta[meta_name])
                 if parsed_date:
                     return parsed_date
         
@@ -168,6 +393,11 @@ class WebScraperService:
         """
         Parse date string into YYYY-MM-DD format.
         
+        ISO 8601 strings (the common case for meta tags) take the C
+        fromisoformat fast path; anything else ("15 January 2024",
+        "Jan 15, 2024", "2024/01/15", "2024") goes to dateutil. Strings
+        without a year ("June 5", "10:30") are treated as undated.
+        
         Args:
             date_str: Date string in various formats
             
@@ -179,37 +409,19 @@ class WebScraperService:
         
         date_str = date_str.strip()
         
-        # List of date formats to try
-        formats = [
-            '%Y-%m-%d',           # 2024-01-15
-            '%Y-%m-%dT%H:%M:%S',  # 2024-01-15T10:30:00
-            '%Y-%m-%dT%H:%M:%SZ', # 2024-01-15T10:30:00Z
-            '%Y/%m/%d',           # 2024/01/15
-            '%d %B %Y',           # 15 January 2024
-            '%B %d, %Y',          # January 15, 2024
-            '%d %b %Y',           # 15 Jan 2024
-            '%b %d, %Y',          # Jan 15, 2024
-            '%Y',                 # 2024 (year only)
-        ]
-        
-        for fmt in formats:
-            try:
-                dt = datetime.strptime(date_str, fmt)
-                return dt.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-        
-        # Try ISO format parsing
         try:
-            # Handle ISO format with timezone
-            if 'T' in date_str:
-                date_part = date_str.split('T')[0]
-                datetime.strptime(date_part, '%Y-%m-%d')
-                return date_part
+            return datetime.fromisoformat(date_str.removesuffix('Z')).date().isoformat()
         except ValueError:
             pass
         
-        return None
+        try:
+            # Missing month/day default to January 1st, so "2024" -> 2024-01-01
+            parsed = dateutil_parser.parse(date_str, default=_DATE_DEFAULT)
+            if dateutil_parser.parse(date_str, default=_DATE_DEFAULT_ALT).year != parsed.year:
+                return None  # no year in the string: treat as undated
+            return parsed.date().isoformat()
+        except (ValueError, OverflowError):
+            return None
     
     def _fallback_metadata(self, url: str) -> Dict[str, Optional[str]]:
         """Return empty metadata when scraping fails."""
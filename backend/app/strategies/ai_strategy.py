@@ -1,13 +1,94 @@
 # File: backend/app/strategies/ai_strategy.py
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Union
+import hashlib
 import json
+import re
+import threading
+import httpx
+from cachetools import TTLCache
 from sqlalchemy.orm import Session
 from anthropic import Anthropic
 
 from app.models import Reference
 from app.strategies.base_strategy import AnalysisStrategy
-from app.config import settings
+from app.config import get_settings
+
+
+AI_MODEL = "claude-sonnet-4-20250514"
+
+# Identical prompts (same metadata) reuse the earlier answer for a week
+RESPONSE_CACHE_TTL = 7 * 24 * 3600
+RESPONSE_CACHE_MAXSIZE = 10_000
+
+_response_cache: TTLCache = TTLCache(maxsize=RESPONSE_CACHE_MAXSIZE, ttl=RESPONSE_CACHE_TTL)
+_response_cache_lock = threading.Lock()  # strategies run in worker threads
+
+
+# References packed into one Claude request by analyze_batch
+AI_BATCH_SIZE = 10
+
+# Criteria shared by the single and batch prompts
+_EVALUATION_CRITERIA = """Evaluation Criteria:
+1. Title Quality (0-8 points):
+   - Is the title descriptive and specific?
+   - Does it use professional academic language?
+   - Are there any red flags (clickbait, excessive claims)?
+
+2. Source Professionalism (0-8 points):
+   - Does the domain suggest a credible publisher?
+   - Is author information provided?
+   - Does the publication date indicate recency?
+
+3. Content Indicators (0-9 points):
+   - Based on title/metadata, does this appear to be:
+     * Peer-reviewed research
+     * Evidence-based reporting
+     * Opinion/blog content
+     * Marketing/promotional material"""
+
+
+# SCORE line immediately followed by ANALYSIS (which may span lines)
+_SCORE_RE = re.compile(
+    r'^\s*SCORE:\s*(\d+)\s*$\s*^\s*ANALYSIS:\s*(.+?)(?:\Z|\n[A-Z]+:)',
+    re.MULTILINE | re.DOTALL
+)
+# Fallbacks for replies that use the labels out of order
+_SCORE_LINE_RE = re.compile(r'^SCORE:\s*(\d+)', re.MULTILINE)
+_ANALYSIS_LINE_RE = re.compile(r'^ANALYSIS:(.*)$', re.MULTILINE)
+_WORD_RE = re.compile(r'\w+')
+
+# Keywords used to infer a score from an unstructured reply
+_POSITIVE_WORDS = frozenset({"excellent", "credible"})
+_NEUTRAL_WORDS = frozenset({"good", "reliable"})
+_NEGATIVE_WORDS = frozenset({"poor", "unreliable", "questionable"})
+
+
+def _prompt_key(prompt: str) -> str:
+    """Cache key for a prompt sent to AI_MODEL."""
+    return hashlib.sha256(f"{AI_MODEL}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+# Shared across strategy instances so keep-alive connections to the API survive
+_client: Optional[Anthropic] = None
+_client_lock = threading.Lock()
+
+
+def get_anthropic_client() -> Anthropic:
+    """Return the process-wide Anthropic client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = Anthropic(
+                    api_key=get_settings().ANTHROPIC_API_KEY,
+                    max_retries=2,
+                    http_client=httpx.Client(
+                        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                        timeout=60.0,
+                    ),
+                )
+    return _client
 
 
 class AIAnalysisStrategy(AnalysisStrategy):
@@ -25,7 +106,7 @@ class AIAnalysisStrategy(AnalysisStrategy):
     
     def __init__(self, db: Session):
         super().__init__(db)
-        self.client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+        self.client = get_anthropic_client()
     
     @property
     def name(self) -> str:
@@ -50,23 +131,23 @@ class AIAnalysisStrategy(AnalysisStrategy):
         # Let's do a simple analysis based on available metadata
         
         if not reference.title and not reference.author:
-            return {
-                "score": 5,
-                "explanation": "Insufficient information for AI analysis. "
-                              "Default score of 5/25 assigned.",
-                "details": {
-                    "ai_analysis": "No content available for analysis"
-                }
-            }
+            return self._insufficient_result()
         
         try:
             # Prepare prompt for Claude
             prompt = self._create_analysis_prompt(reference)
+            cache_key = _prompt_key(prompt)
+            
+            with _response_cache_lock:
+                cached = _response_cache.get(cache_key)
+            if cached is not None:
+                return cached
             
-            # Call Claude API
+            # Call Claude API (temperature 0 so a cached answer is the answer we'd get again)
             response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
+                model=AI_MODEL,
                 max_tokens=500,
+                temperature=0,
                 messages=[
                     {
                         "role": "user",
@@ -81,26 +162,141 @@ class AIAnalysisStrategy(AnalysisStrategy):
             # Extract score and analysis from AI response
             score, analysis = self._parse_ai_response(ai_response)
             
-            return {
-                "score": self._clamp_score(score),
-                "explanation": analysis,
-                "details": {
-                    "ai_analysis": ai_response,
-                    "model": "claude-sonnet-4-20250514"
-                }
-            }
+            result = self._success_result(score, analysis, ai_response)
+            
+            # Only successful answers are cached; errors are retried next time
+            with _response_cache_lock:
+                _response_cache[cache_key] = result
+            return result
         
         except Exception as e:
-            # If AI analysis fails, return conservative score
-            return {
-                "score": 10,
-                "explanation": f"AI analysis encountered an error. "
-                              f"Conservative score of 10/25 assigned. Error: {str(e)}",
-                "details": {
-                    "ai_analysis": f"Error: {str(e)}",
-                    "error": True
+            return self._error_result(e)
+    
+    def analyze_batch(self, references: List[Reference]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Analyze several references with one Claude request per AI_BATCH_SIZE.
+        
+        References without metadata or with a cached answer never reach the
+        API. The rest share a prompt that asks for a JSON array; any entry
+        missing from the reply is retried with the single-reference prompt.
+        
+        Args:
+            references: References to analyze
+            
+        Returns:
+            One result per reference, in input order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(references)
+        pending = []  # (index, cache key)
+        
+        for index, reference in enumerate(references):
+            if not reference.title and not reference.author:
+                results[index] = self._insufficient_result()
+                continue
+            
+            cache_key = _prompt_key(self._create_analysis_prompt(reference))
+            with _response_cache_lock:
+                cached = _response_cache.get(cache_key)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append((index, cache_key))
+        
+        for start in range(0, len(pending), AI_BATCH_SIZE):
+            chunk = pending[start:start + AI_BATCH_SIZE]
+            
+            if len(chunk) == 1:
+                index, _ = chunk[0]
+                results[index] = self.analyze(references[index])
+                continue
+            
+            try:
+                parsed = self._request_batch([references[index] for index, _ in chunk])
+            except Exception as e:
+                for index, _ in chunk:
+                    results[index] = self._error_result(e)
+                continue
+            
+            for position, (index, cache_key) in enumerate(chunk):
+                if position not in parsed:
+                    # Entry missing or malformed in the batch reply
+                    results[index] = self.analyze(references[index])
+                    continue
+                
+                score, analysis, ai_response = parsed[position]
+                result = self._success_result(score, analysis, ai_response)
+                with _response_cache_lock:
+                    _response_cache[cache_key] = result
+                results[index] = result
+        
+        return results
+    
+    def _request_batch(self, references: List[Reference]) -> Dict[int, tuple[int, str, str]]:
+        """
+        Send one prompt covering several references.
+        
+        Args:
+            references: References to analyze together
+            
+        Returns:
+            Mapping of position in references -> (score, analysis, raw reply entry)
+        """
+        response = self.client.messages.create(
+            model=AI_MODEL,
+            max_tokens=300 * len(references),
+            temperature=0,
+            messages=[
+                {
+                    "role": "user",
+                    "content": self._create_batch_prompt(references)
                 }
+            ]
+        )
+        return self._parse_batch_response(response.content[0].text, len(references))
+    
+    def _insufficient_result(self) -> Dict[str, Any]:
+        """Result for references with neither title nor author."""
+        return {
+            "score": 5,
+            "explanation": "Insufficient information for AI analysis. "
+                          "Default score of 5/25 assigned.",
+            "details": {
+                "ai_analysis": "No content available for analysis"
+            }
+        }
+    
+    def _success_result(self, score: int, analysis: str, ai_response: str) -> Dict[str, Any]:
+        """Result for a parsed Claude answer."""
+        return {
+            "score": self._clamp_score(score),
+            "explanation": analysis,
+            "details": {
+                "ai_analysis": ai_response,
+                "model": AI_MODEL
             }
+        }
+    
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        """If AI analysis fails, return conservative score."""
+        return {
+            "score": 10,
+            "explanation": f"AI analysis encountered an error. "
+                          f"Conservative score of 10/25 assigned. Error: {str(error)}",
+            "details": {
+                "ai_analysis": f"Error: {str(error)}",
+                "error": True
+            }
+        }
+    
+    def _metadata_block(self, reference: Reference) -> str:
+        """Metadata sent to Claude for one reference, as plain key: value lines."""
+        return (
+            f"url: {reference.url}\n"
+            f"domain: {reference.domain}\n"
+            f"title: {reference.title or ''}\n"
+            f"author: {reference.author or ''}\n"
+            f"date: {reference.publication_date or ''}"
+        )
     
     def _create_analysis_prompt(self, reference: Reference) -> str:
         """
@@ -112,37 +308,13 @@ class AIAnalysisStrategy(AnalysisStrategy):
         Returns:
             Analysis prompt
         """
-        metadata = {
-            "url": reference.url,
-            "domain": reference.domain,
-            "title": reference.title,
-            "author": reference.author,
-            "publication_date": str(reference.publication_date) if reference.publication_date else None
-        }
-        
         return f"""You are analyzing an academic/research reference for credibility. 
 Based on the metadata provided, assess the following criteria and provide a credibility score from 0-25:
 
 Reference Metadata:
-{json.dumps(metadata, indent=2)}
+{self._metadata_block(reference)}
 
-Evaluation Criteria:
-1. Title Quality (0-8 points):
-   - Is the title descriptive and specific?
-   - Does it use professional academic language?
-   - Are there any red flags (clickbait, excessive claims)?
-
-2. Source Professionalism (0-8 points):
-   - Does the domain suggest a credible publisher?
-   - Is author information provided?
-   - Does the publication date indicate recency?
-
-3. Content Indicators (0-9 points):
-   - Based on title/metadata, does this appear to be:
-     * Peer-reviewed research
-     * Evidence-based reporting
-     * Opinion/blog content
-     * Marketing/promotional material
+{_EVALUATION_CRITERIA}
 
 Provide your response in this exact format:
 SCORE: [number from 0-25]
@@ -150,6 +322,67 @@ ANALYSIS: [2-3 sentence explanation of your assessment]
 
 Be critical but fair. Academic sources should score higher, but good journalism can also score well."""
     
+    def _create_batch_prompt(self, references: List[Reference]) -> str:
+        """
+        Create one prompt asking Claude to score several references.
+        
+        Args:
+            references: Reference objects
+            
+        Returns:
+            Analysis prompt expecting a JSON array reply
+        """
+        entries = "\n\n".join(
+            f"id: {position}\n{self._metadata_block(reference)}"
+            for position, reference in enumerate(references)
+        )
+        
+        return f"""You are analyzing academic/research references for credibility. 
+For EACH reference below, assess the following criteria independently and provide a credibility score from 0-25:
+
+References:
+{entries}
+
+{_EVALUATION_CRITERIA}
+
+Respond with ONLY a JSON array, one object per reference, in this exact shape:
+[{{"id": 0, "score": <number from 0-25>, "analysis": "<2-3 sentence explanation>"}}, ...]
+
+Be critical but fair. Academic sources should score higher, but good journalism can also score well."""
+    
+    def _parse_batch_response(self, ai_response: str, count: int) -> Dict[int, tuple[int, str, str]]:
+        """
+        Parse Claude's JSON array reply to a batch prompt.
+        
+        Args:
+            ai_response: Raw response from Claude
+            count: Number of references in the prompt
+            
+        Returns:
+            Mapping of reference id -> (score, analysis, that reference's entry
+            of the reply as JSON text); malformed entries are left out
+        """
+        # Tolerate prose or code fences around the array
+        start, end = ai_response.find("["), ai_response.rfind("]")
+        if start == -1 or end < start:
+            return {}
+        try:
+            entries = json.loads(ai_response[start:end + 1])
+        except json.JSONDecodeError:
+            return {}
+        
+        parsed = {}
+        for entry in entries if isinstance(entries, list) else []:
+            try:
+                ref_id = int(entry["id"])
+                score = int(entry["score"])
+                analysis = str(entry["analysis"]).strip()
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= ref_id < count:
+                parsed[ref_id] = (score, analysis, json.dumps(entry, ensure_ascii=False))
+        return parsed
+    
     def _parse_ai_response(self, ai_response: str) -> tuple[int, str]:
         """
         Parse Claude's response to extract score and analysis.
@@ -160,28 +393,32 @@ Be critical but fair. Academic sources should score higher, but good journalism
         Returns:
             Tuple of (score, analysis)
         """
-        lines = ai_response.strip().split('\n')
+        match = _SCORE_RE.search(ai_response)
+        if match:
+            return int(match.group(1)), match.group(2).strip()
+        
         score = 10  # Default
         analysis = "AI analysis completed."
         
-        for line in lines:
-            if line.startswith("SCORE:"):
-                try:
-                    score = int(line.split("SCORE:")[1].strip())
-                except (ValueError, IndexError):
-                    pass
-            elif line.startswith("ANALYSIS:"):
-                analysis = line.split("ANALYSIS:")[1].strip()
+        if "SCORE:" in ai_response:
+            score_match = _SCORE_LINE_RE.search(ai_response)
+            if score_match:
+                score = int(score_match.group(1))
+            analysis_match = _ANALYSIS_LINE_RE.search(ai_response)
+            if analysis_match:
+                analysis = analysis_match.group(1).strip()
+            return score, analysis
         
         # If we didn't find structured format, use whole response as analysis
-        if "SCORE:" not in ai_response:
-            analysis = ai_response
-            # Try to infer score from keywords
-            if any(word in ai_response.lower() for word in ["excellent", "high quality", "credible"]):
-                score = 20
-            elif any(word in ai_response.lower() for word in ["good", "reliable"]):
-                score = 15
-            elif any(word in ai_response.lower() for word in ["poor", "unreliable", "questionable"]):
-                score = 5
-        
-        return score, analysis
\ No newline at end of file
+        analysis = ai_response
+        # Try to infer score from keywords
+        lower = ai_response.lower()
+        words = set(_WORD_RE.findall(lower))
+        if words & _POSITIVE_WORDS or "high quality" in lower:
+            score = 20
+        elif words & _NEUTRAL_WORDS:
+            score = 15
+        elif words & _NEGATIVE_WORDS:
+            score = 5
+        
+        return score, analysis
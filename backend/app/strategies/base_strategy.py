@@ -1,7 +1,7 @@
 # File: backend/app/strategies/base_strategy.py
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Union
 from sqlalchemy.orm import Session
 
 from app.models import Reference
@@ -52,6 +52,28 @@ class AnalysisStrategy(ABC):
         """
         pass
     
+    def analyze_batch(self, references: List[Reference]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Analyze several references at once.
+        
+        The default runs analyze() per reference; strategies that can share
+        work across references (one API call, one model pass) override it.
+        
+        Args:
+            references: References to analyze
+            
+        Returns:
+            One result per reference, in input order. A reference whose
+            analysis raised gets the exception instead of a result.
+        """
+        results = []
+        for reference in references:
+            try:
+                results.append(self.analyze(reference))
+            except Exception as e:
+                results.append(e)
+        return results
+    
     def _clamp_score(self, score: int) -> int:
         """
         Ensure score is within valid range [0, max_score].
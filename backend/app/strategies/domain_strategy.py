@@ -1,12 +1,99 @@
 # File: backend/app/strategies/domain_strategy.py
 
-from typing import Dict, Any
+import re
+import threading
+from typing import Dict, Any, Optional, Tuple
+from cachetools import TTLCache
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.models import Reference, DomainReputation, DomainCategory
 from app.strategies.base_strategy import AnalysisStrategy
 
 
+# (base_score, category, is_verified) per domain; plain tuples so no ORM
+# object (and its Session) outlives the lookup. None marks an unknown domain.
+DomainInfo = Tuple[int, str, bool]
+
+# Keywords that suggest an academic origin for unknown domains, matched in one pass
+ACADEMIC_KEYWORDS = ('university', 'academic', 'research', 'scholar', 'institute')
+_ACADEMIC_KEYWORDS_RE = re.compile("|".join(map(re.escape, ACADEMIC_KEYWORDS)))
+
+# Explanations for known domains by category; only the selected one is formatted
+_EXPLANATION_TEMPLATES = {
+    "academic": "Domain {domain} is a {verified_text} academic/research source. "
+                "Academic sources typically undergo peer review and maintain high standards. "
+                "Score: {score}/30",
+    
+    "government": "Domain {domain} is a {verified_text} government source. "
+                  "Government sources are generally reliable for official data and policies. "
+                  "Score: {score}/30",
+    
+    "news": "Domain {domain} is a {verified_text} news outlet. "
+            "Established news organizations follow journalistic standards. "
+            "Score: {score}/30",
+    
+    "unreliable": "Domain {domain} is flagged as unreliable in our database. "
+                  "This source has been identified as problematic. "
+                  "Score: {score}/30",
+    
+    "unknown": "Domain {domain} is in our database but category is unknown. "
+               "Score: {score}/30",
+}
+_FALLBACK_EXPLANATION = "Domain {domain} scored {score}/30 based on our reputation database."
+
+DOMAIN_CACHE_TTL = 3600
+DOMAIN_CACHE_MAXSIZE = 4096
+
+_domain_cache: TTLCache = TTLCache(maxsize=DOMAIN_CACHE_MAXSIZE, ttl=DOMAIN_CACHE_TTL)
+_domain_cache_lock = threading.Lock()  # strategies run in worker threads
+
+
+def _fetch_domain_info(db: Session, domain: str) -> Optional[DomainInfo]:
+    """Return the cached reputation of domain, querying the database on a miss."""
+    with _domain_cache_lock:
+        if domain in _domain_cache:
+            return _domain_cache[domain]
+    
+    row = db.execute(
+        select(DomainReputation.base_score, DomainReputation.category, DomainReputation.is_verified)
+        .where(DomainReputation.domain_name == domain)
+    ).first()
+    info = (row.base_score, row.category.value, row.is_verified) if row else None
+    
+    with _domain_cache_lock:
+        _domain_cache[domain] = info
+    return info
+
+
+def preload_domain_cache(db: Session) -> int:
+    """
+    Load the whole domain reputation table into the cache if it fits.
+    
+    Args:
+        db: SQLAlchemy database session
+        
+    Returns:
+        Number of domains loaded (0 if the table is larger than the cache)
+    """
+    count = db.scalar(select(func.count()).select_from(DomainReputation))
+    if count > DOMAIN_CACHE_MAXSIZE:
+        return 0
+    
+    rows = db.execute(
+        select(
+            DomainReputation.domain_name,
+            DomainReputation.base_score,
+            DomainReputation.category,
+            DomainReputation.is_verified,
+        )
+    ).all()
+    with _domain_cache_lock:
+        for row in rows:
+            _domain_cache[row.domain_name] = (row.base_score, row.category.value, row.is_verified)
+    return len(rows)
+
+
 class DomainAnalysisStrategy(AnalysisStrategy):
     """
     Analyzes reference credibility based on domain reputation.
@@ -44,16 +131,12 @@ class DomainAnalysisStrategy(AnalysisStrategy):
                 "details": {"category": "unknown", "verified": False}
             }
         
-        # Query domain reputation database
-        domain_rep = self.db.query(DomainReputation).filter(
-            DomainReputation.domain_name == reference.domain
-        ).first()
+        # Look up domain reputation (process-local cache in front of the database)
+        domain_info = _fetch_domain_info(self.db, reference.domain)
         
-        if domain_rep:
+        if domain_info:
             # Known domain - use stored score
-            score = domain_rep.base_score
-            category = domain_rep.category.value
-            verified = domain_rep.is_verified
+            score, category, verified = domain_info
             
             explanation = self._generate_explanation(
                 reference.domain, 
@@ -107,8 +190,7 @@ class DomainAnalysisStrategy(AnalysisStrategy):
             )
         
         # Check for research/academic keywords
-        academic_keywords = ['university', 'academic', 'research', 'scholar', 'institute']
-        if any(keyword in domain_lower for keyword in academic_keywords):
+        if _ACADEMIC_KEYWORDS_RE.search(domain_lower):
             return (
                 15,
                 "unknown",
@@ -145,28 +227,5 @@ class DomainAnalysisStrategy(AnalysisStrategy):
         """
         verified_text = "verified" if verified else "catalogued"
         
-        explanations = {
-            "academic": f"Domain {domain} is a {verified_text} academic/research source. "
-                       f"Academic sources typically undergo peer review and maintain high standards. "
-                       f"Score: {score}/30",
-            
-            "government": f"Domain {domain} is a {verified_text} government source. "
-                         f"Government sources are generally reliable for official data and policies. "
-                         f"Score: {score}/30",
-            
-            "news": f"Domain {domain} is a {verified_text} news outlet. "
-                   f"Established news organizations follow journalistic standards. "
-                   f"Score: {score}/30",
-            
-            "unreliable": f"Domain {domain} is flagged as unreliable in our database. "
-                         f"This source has been identified as problematic. "
-                         f"Score: {score}/30",
-            
-            "unknown": f"Domain {domain} is in our database but category is unknown. "
-                      f"Score: {score}/30"
-        }
-        
-        return explanations.get(
-            category, 
-            f"Domain {domain} scored {score}/30 based on our reputation database."
-        )
\ No newline at end of file
+        template = _EXPLANATION_TEMPLATES.get(category, _FALLBACK_EXPLANATION)
+        return template.format_map({"domain": domain, "verified_text": verified_text, "score": score})
\ No newline at end of file
@@ -1,6 +1,7 @@
 # File: backend/app/strategies/metadata_strategy.py
 
-from typing import Dict, Any
+from bisect import bisect_left, bisect_right
+from typing import Dict, Any, List, Union
 from datetime import datetime, date, timedelta
 from sqlalchemy.orm import Session
 
@@ -8,6 +9,28 @@ from app.models import Reference
 from app.strategies.base_strategy import AnalysisStrategy
 
 
+# Recency bands by age in whole days: <=2, <=5, <=10 years (365.25-day years), older
+_RECENCY_MAX_DAYS = (730, 1826, 3652)
+_RECENCY_RESULTS = (
+    (5, "✓ Recent publication ({:.1f} years old, +5 points)"),
+    (3, "○ Moderately recent ({:.1f} years old, +3 points)"),
+    (1, "○ Older publication ({:.1f} years old, +1 point)"),
+    (0, "✗ Very old publication ({:.1f} years old, 0 points)"),
+)
+_FUTURE_DATE_RESULT = (0, "⚠ Publication date is in the future (suspicious, 0 points)")
+
+# Overall quality wording by total score: <5, 5-9, 10-14, 15-17, >=18
+_EXPLANATION_INTRO = "Metadata quality score: {}/20. "
+_QUALITY_MIN_SCORES = (5, 10, 15, 18)
+_QUALITY_TIERS = (
+    "Very poor metadata - critical information absent.",
+    "Poor metadata quality - significant information missing.",
+    "Adequate metadata, but some information missing.",
+    "Good metadata quality.",
+    "Excellent metadata completeness.",
+)
+
+
 class MetadataAnalysisStrategy(AnalysisStrategy):
     """
     Analyzes reference credibility based on metadata quality.
@@ -38,6 +61,29 @@ class MetadataAnalysisStrategy(AnalysisStrategy):
         Returns:
             Dictionary with score, explanation, and metadata details
         """
+        return self._analyze(reference, date.today())
+    
+    def analyze_batch(self, references: List[Reference]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Analyze several references against one shared date.today().
+        
+        Args:
+            references: References to analyze
+            
+        Returns:
+            One result (or raised exception) per reference, in input order
+        """
+        today = date.today()
+        results = []
+        for reference in references:
+            try:
+                results.append(self._analyze(reference, today))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def _analyze(self, reference: Reference, today: date) -> Dict[str, Any]:
+        """Score one reference with today's date supplied by the caller."""
         score = 0
         details = {}
         explanations = []
@@ -58,10 +104,11 @@ class MetadataAnalysisStrategy(AnalysisStrategy):
             details["publication_date"] = reference.publication_date.isoformat()
             
             # Check recency (5 points for publications within 2 years)
-            age_score, age_explanation = self._analyze_recency(reference.publication_date)
+            age_days = (today - reference.publication_date).days
+            age_score, age_explanation = self._analyze_recency(age_days)
             score += age_score
             details["recency_score"] = age_score
-            details["age_days"] = (date.today() - reference.publication_date).days
+            details["age_days"] = age_days
             
             explanations.append(f"✓ Publication date: {reference.publication_date}")
             explanations.append(age_explanation)
@@ -79,35 +126,22 @@ class MetadataAnalysisStrategy(AnalysisStrategy):
             "details": details
         }
     
-    def _analyze_recency(self, pub_date: date) -> tuple[int, str]:
+    def _analyze_recency(self, age_days: int) -> tuple[int, str]:
         """
         Analyze how recent the publication is.
         
         Args:
-            pub_date: Publication date
+            age_days: Days since publication (negative for future dates)
             
         Returns:
             Tuple of (score, explanation)
         """
-        today = date.today()
-        age = today - pub_date
-        years_old = age.days / 365.25
-        
-        if years_old < 0:
+        if age_days < 0:
             # Future date - suspicious
-            return (0, "⚠ Publication date is in the future (suspicious, 0 points)")
-        elif years_old <= 2:
-            # Very recent
-            return (5, f"✓ Recent publication ({years_old:.1f} years old, +5 points)")
-        elif years_old <= 5:
-            # Moderately recent
-            return (3, f"○ Moderately recent ({years_old:.1f} years old, +3 points)")
-        elif years_old <= 10:
-            # Older but still relevant
-            return (1, f"○ Older publication ({years_old:.1f} years old, +1 point)")
-        else:
-            # Very old
-            return (0, f"✗ Very old publication ({years_old:.1f} years old, 0 points)")
+            return _FUTURE_DATE_RESULT
+        
+        score, template = _RECENCY_RESULTS[bisect_left(_RECENCY_MAX_DAYS, age_days)]
+        return (score, template.format(age_days / 365.25))
     
     def _generate_explanation(self, score: int, explanations: list[str]) -> str:
         """
@@ -120,17 +154,7 @@ class MetadataAnalysisStrategy(AnalysisStrategy):
         Returns:
             Combined explanation string
         """
-        intro = f"Metadata quality score: {score}/20. "
-        
-        if score >= 18:
-            quality = "Excellent metadata completeness."
-        elif score >= 15:
-            quality = "Good metadata quality."
-        elif score >= 10:
-            quality = "Adequate metadata, but some information missing."
-        elif score >= 5:
-            quality = "Poor metadata quality - significant information missing."
-        else:
-            quality = "Very poor metadata - critical information absent."
+        intro = _EXPLANATION_INTRO.format(score)
+        quality = _QUALITY_TIERS[bisect_right(_QUALITY_MIN_SCORES, score)]
         
         return intro + quality + " " + " ".join(explanations)
\ No newline at end of file
@@ -1,11 +1,32 @@
 # File: backend/app/strategies/rag_strategy.py
 
-from typing import Dict, Any
+from bisect import bisect_right
+from typing import Dict, Any, List, Union
 from sqlalchemy.orm import Session
 
 from app.models import Reference
 from app.strategies.base_strategy import AnalysisStrategy
 from app.services.rag_service import RAGService
+from app.services.proximity_cache import ProximityCache
+from app.config import get_settings
+
+
+# Base score by number of similar sources found (5 or more -> last entry)
+_COUNT_SCORES = (5, 8, 13, 17, 20, 25)
+
+# Average similarity bands [<0.5, 0.5-0.6, 0.6-0.8, >=0.8] and their multipliers
+_SIMILARITY_BOUNDS = (0.5, 0.6, 0.8)
+_SIMILARITY_MULTIPLIERS = (0.7, 0.8, 0.9, 1.0)
+_SIMILARITY_LABELS = ("low similarity", "moderate similarity", "good similarity", "very high similarity")
+
+# URL slug separators -> spaces, in one pass
+_SLUG_TRANS = str.maketrans({"-": " ", "_": " "})
+
+# Near-duplicate queries (re-checks of the same title) skip the vector search
+_analysis_cache = ProximityCache(
+    max_size=get_settings().RAG_CACHE_MAX_SIZE,
+    tau=get_settings().RAG_CACHE_TAU,
+)
 
 
 class RAGAnalysisStrategy(AnalysisStrategy):
@@ -48,79 +69,106 @@ class RAGAnalysisStrategy(AnalysisStrategy):
         query_text = self._prepare_query_text(reference)
         
         if not query_text:
-            return {
-                "score": 5,
-                "explanation": "Insufficient information to perform cross-reference analysis. "
-                              "Default score of 5/25 assigned.",
-                "details": {
-                    "similar_sources": [],
-                    "count": 0,
-                    "has_corroboration": False
-                }
-            }
+            return self._insufficient_result()
         
         # Find similar sources
         try:
-            analysis = self.rag_service.analyze_cross_references(query_text, top_k=5)
-            similar_sources = analysis["similar_sources"]
-            count = analysis["count"]
-            avg_similarity = analysis["average_similarity"]
-            
-            # Calculate score based on number and quality of similar sources
-            score = self._calculate_score(count, avg_similarity)
-            
-            # Generate explanation
-            explanation = self._generate_explanation(
-                count, 
-                avg_similarity, 
-                score,
-                similar_sources
-            )
-            
-            return {
-                "score": self._clamp_score(score),
-                "explanation": explanation,
-                "details": {
-                    "similar_sources": similar_sources,
-                    "count": count,
-                    "average_similarity": avg_similarity,
-                    "has_corroboration": analysis["has_corroboration"]
-                }
-            }
-        
+            return self._score_embedding(self.rag_service.embed(query_text))
         except Exception as e:
             self.db.rollback()
+            return self._error_result(e)
+    
+    def analyze_batch(self, references: List[Reference]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Analyze several references with one batched embedding pass.
+        
+        Args:
+            references: References to analyze
             
-            # If RAG search fails, return default score
-            return {
-                "score": 5,
-                "explanation": f"Cross-reference analysis encountered an error. "
-                              f"Default score of 5/25 assigned. Error: {str(e)}",
-                "details": {
-                    "similar_sources": [],
-                    "count": 0,
-                    "has_corroboration": False,
-                    "error": str(e)
-                }
+        Returns:
+            One result per reference, in input order
+        """
+        query_texts = [self._prepare_query_text(reference) for reference in references]
+        results: List[Dict[str, Any]] = [self._insufficient_result() for _ in references]
+        pending = [index for index, query_text in enumerate(query_texts) if query_text]
+        if not pending:
+            return results
+        
+        try:
+            embeddings = self.rag_service.embed_batch([query_texts[index] for index in pending])
+        except Exception as e:
+            for index in pending:
+                results[index] = self._error_result(e)
+            return results
+        
+        for index, embedding in zip(pending, embeddings):
+            try:
+                results[index] = self._score_embedding(embedding)
+            except Exception as e:
+                self.db.rollback()
+                results[index] = self._error_result(e)
+        return results
+    
+    def _score_embedding(self, embedding) -> Dict[str, Any]:
+        """Score one query embedding, consulting the proximity cache first."""
+        analysis = _analysis_cache.get(embedding)
+        if analysis is None:
+            analysis = self.rag_service.analyze_embedding(embedding, top_k=5)
+            _analysis_cache.set(embedding, analysis)
+        similar_sources = analysis["similar_sources"]
+        count = analysis["count"]
+        avg_similarity = analysis["average_similarity"]
+        
+        # Calculate score based on number and quality of similar sources
+        score = self._calculate_score(count, avg_similarity)
+        
+        # Generate explanation
+        explanation = self._generate_explanation(
+            count, 
+            avg_similarity, 
+            score,
+            similar_sources
+        )
+        
+        return {
+            "score": self._clamp_score(score),
+            "explanation": explanation,
+            "details": {
+                "similar_sources": similar_sources,
+                "count": count,
+                "average_similarity": avg_similarity,
+                "has_corroboration": analysis["has_corroboration"]
+            }
+        }
+    
+    def _insufficient_result(self) -> Dict[str, Any]:
+        """Result for references with nothing to search on."""
+        return {
+            "score": 5,
+            "explanation": "Insufficient information to perform cross-reference analysis. "
+                          "Default score of 5/25 assigned.",
+            "details": {
+                "similar_sources": [],
+                "count": 0,
+                "has_corroboration": False
+            }
+        }
+    
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        """If RAG search fails, return default score."""
+        return {
+            "score": 5,
+            "explanation": f"Cross-reference analysis encountered an error. "
+                          f"Default score of 5/25 assigned. Error: {str(error)}",
+            "details": {
+                "similar_sources": [],
+                "count": 0,
+                "has_corroboration": False,
+                "error": str(error)
             }
+        }
     
     def _prepare_query_text(self, reference: Reference) -> str:
-        parts = []
-
-        if reference.title:
-            parts.append(reference.title)
-
-        # If your Reference model has any summary/description field, use it
-        if hasattr(reference, "abstract") and reference.abstract:
-            parts.append(reference.abstract)
-
-        # Fallback: if no abstract, use URL-derived hints
-        if len(parts) == 1 and reference.url:
-            slug = reference.url.split("/")[-1]
-            slug = slug.replace("-", " ").replace("_", " ")
-            parts.append(slug)
-
-        return ". ".join(parts)
         """
         Prepare text for RAG similarity search.
         
@@ -131,18 +179,20 @@ class RAGAnalysisStrategy(AnalysisStrategy):
             Combined text for search, or empty string if insufficient info
         """
         parts = []
-        
+
         if reference.title:
             parts.append(reference.title)
-        
-        if reference.author:
-            parts.append(f"by {reference.author}")
-        
-        # If we have very little info, use URL as fallback
-        if not parts and reference.url:
-            # Extract some info from URL (domain, path keywords)
-            parts.append(reference.url.split('/')[-1].replace('-', ' ').replace('_', ' '))
-        
+
+        # If your Reference model has any summary/description field, use it
+        abstract = getattr(reference, "abstract", None)
+        if abstract:
+            parts.append(abstract)
+
+        # Fallback: if no abstract, use URL-derived hints
+        if len(parts) == 1 and reference.url:
+            slug = reference.url.split("/")[-1].translate(_SLUG_TRANS)
+            parts.append(slug)
+
         return ". ".join(parts)
     
     def _calculate_score(self, count: int, avg_similarity: float) -> int:
@@ -156,33 +206,10 @@ class RAGAnalysisStrategy(AnalysisStrategy):
         Returns:
             Score from 5 to 25
         """
-        # Base score on count
-        if count >= 5:
-            base_score = 25
-        elif count == 4:
-            base_score = 20
-        elif count == 3:
-            base_score = 17
-        elif count == 2:
-            base_score = 13
-        elif count == 1:
-            base_score = 8
-        else:
-            base_score = 5
-        
-        # Adjust based on average similarity quality
-        if avg_similarity < 0.5:
-            # Low similarity - reduce score
-            base_score = int(base_score * 0.7)
-        elif avg_similarity >= 0.8:
-            # Very high similarity - keep full score
-            pass
-        elif avg_similarity >= 0.6:
-            # Good similarity - slight reduction
-            base_score = int(base_score * 0.9)
-        else:
-            # Moderate similarity
-            base_score = int(base_score * 0.8)
+        # Base score on count, adjusted by average similarity quality
+        base_score = _COUNT_SCORES[min(count, len(_COUNT_SCORES) - 1)]
+        multiplier = _SIMILARITY_MULTIPLIERS[bisect_right(_SIMILARITY_BOUNDS, avg_similarity)]
+        base_score = int(base_score * multiplier)
         
         return base_score
     
@@ -219,15 +246,7 @@ class RAGAnalysisStrategy(AnalysisStrategy):
             for s in top_sources
         ])
         
-        quality_desc = ""
-        if avg_similarity >= 0.8:
-            quality_desc = "very high similarity"
-        elif avg_similarity >= 0.6:
-            quality_desc = "good similarity"
-        elif avg_similarity >= 0.5:
-            quality_desc = "moderate similarity"
-        else:
-            quality_desc = "low similarity"
+        quality_desc = _SIMILARITY_LABELS[bisect_right(_SIMILARITY_BOUNDS, avg_similarity)]
         
         return (
             f"Found {count} similar source(s) in our database with {quality_desc} "
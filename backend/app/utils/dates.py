@@ -0,0 +1,24 @@
+# File: backend/app/utils/dates.py
+
+from datetime import date, datetime
+
+
+def parse_ymd(value: str) -> date:
+    """
+    Parse a publication date, fast-pathing the common YYYY-MM-DD shape.
+    
+    Args:
+        value: Date string, usually YYYY-MM-DD (any ISO 8601 form is accepted)
+        
+    Returns:
+        Parsed date
+        
+    Raises:
+        ValueError: value is not a valid ISO 8601 date
+    """
+    if len(value) == 10 and value[4] == '-' and value[7] == '-' and value[:4].isdigit():
+        try:
+            return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+        except ValueError:
+            pass  # Let the generic parser produce the error message
+    return datetime.fromisoformat(value).date()
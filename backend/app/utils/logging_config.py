@@ -0,0 +1,66 @@
+# File: backend/app/utils/logging_config.py
+
+import atexit
+import json
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+from app.config import get_settings
+
+_listener = None
+
+# Attributes every LogRecord has; anything else on a record came from extra={...}
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including extra={...} fields."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def setup_logging() -> None:
+    """
+    Route all log records through an in-memory queue.
+    
+    Callers only enqueue records; a background listener thread does the
+    formatting and the actual write, so logging never blocks request or
+    task code on I/O. Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    
+    log_queue = SimpleQueue()
+    
+    settings = get_settings()
+    
+    stream_handler = logging.StreamHandler()
+    if settings.ENVIRONMENT == "production":
+        # Machine-readable records for log aggregation
+        stream_handler.setFormatter(JSONFormatter())
+    else:
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+        )
+    
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(settings.LOG_LEVEL)
+    
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
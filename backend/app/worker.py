@@ -0,0 +1,212 @@
+# File: backend/app/worker.py
+# Celery worker for credibility analysis and N8N webhook dispatch.
+# Run with: celery -A app.worker worker -Q analysis,webhooks
+
+import asyncio
+import logging
+from typing import Any, List, Optional
+from uuid import UUID
+
+from celery import Celery
+from celery.signals import (
+    setup_logging as celery_setup_logging,
+    worker_process_init,
+    worker_process_shutdown,
+)
+from sqlalchemy import select, update
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import Reference
+from app.models.reference import ReferenceStatus
+from app.services.credibility_analyzer import CredibilityAnalyzer
+from app.services.n8n_service import N8NService, close_http_client
+from app.services.rag_service import warm_up_embedding_model
+from app.strategies.domain_strategy import preload_domain_cache
+from app.utils.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+celery_app = Celery("refchk", broker=get_settings().REDIS_URL)
+celery_app.conf.update(
+    task_default_queue="analysis",
+    task_routes={
+        "app.worker.run_credibility_analysis_task": {"queue": "analysis"},
+        "app.worker.run_credibility_analysis_batch_task": {"queue": "analysis"},
+        "app.worker.send_reference_analyzed_task": {"queue": "webhooks"},
+    },
+    task_ignore_result=True,
+    # Analyses take seconds: hand out one at a time per process and only
+    # acknowledge once finished, so a crashed worker's task is redelivered
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+)
+
+
+@celery_setup_logging.connect
+def _configure_worker_logging(**kwargs):
+    """Use the app's queue-based logging instead of Celery's default handlers."""
+    setup_logging()
+
+
+# One event loop per worker process, reused across tasks
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _run_async(coro):
+    """Run a coroutine on this worker process's event loop."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+@worker_process_init.connect
+def _warm_up_worker(**kwargs):
+    """Load the embedding model and domain reputations in each worker process before it takes tasks."""
+    try:
+        warm_up_embedding_model()
+    except Exception as e:
+        # The model will load lazily on the first analysis instead
+        logger.warning("Embedding model warm-up failed: %s", e)
+    
+    try:
+        with SessionLocal() as db:
+            preload_domain_cache(db)
+    except Exception as e:
+        # Domains will be cached on first lookup instead
+        logger.warning("Domain cache preload failed: %s", e)
+
+
+@worker_process_shutdown.connect
+def _close_worker_resources(**kwargs):
+    """Release per-process network resources before the worker process exits."""
+    if _loop is not None and not _loop.is_closed():
+        _loop.run_until_complete(close_http_client())
+        _loop.close()
+
+
+@celery_app.task(queue="analysis")
+def run_credibility_analysis_task(reference_id: str):
+    """
+    Run credibility analysis on a reference.
+
+    Args:
+        reference_id: UUID of reference to analyze (as string)
+    """
+    with SessionLocal() as db:
+        try:
+            # Get reference
+            reference = db.get(Reference, UUID(reference_id))
+
+            if not reference:
+                return
+
+            # Run credibility analysis
+            analyzer = CredibilityAnalyzer(db)
+            report = _run_async(analyzer.analyze_reference(reference))
+
+        except Exception as e:
+            # Discard the failed transaction before recording the failure
+            db.rollback()
+
+            reference = db.get(Reference, UUID(reference_id))
+
+            if reference:
+                reference.status = ReferenceStatus.failed
+                db.commit()
+
+            logger.exception("Credibility analysis failed for %s: %s", reference_id, e)
+            return
+
+        # The report is committed; the webhook is best-effort from here on
+        _queue_reference_analyzed(reference, report)
+
+
+@celery_app.task(queue="analysis")
+def run_credibility_analysis_batch_task(reference_ids: List[str]):
+    """
+    Run credibility analysis on several references at once.
+
+    Strategies see the whole batch, so the AI strategy can score them
+    with far fewer Claude requests than one task per reference.
+
+    Args:
+        reference_ids: UUIDs of references to analyze (as strings)
+    """
+    ids = [UUID(reference_id) for reference_id in reference_ids]
+
+    with SessionLocal() as db:
+        try:
+            references = db.scalars(select(Reference).where(Reference.reference_id.in_(ids))).all()
+
+            if not references:
+                return
+
+            analyzer = CredibilityAnalyzer(db)
+            reports = _run_async(analyzer.analyze_references(references))
+
+        except Exception as e:
+            # Discard the failed transaction before recording the failure
+            db.rollback()
+
+            db.execute(
+                update(Reference)
+                .where(Reference.reference_id.in_(ids))
+                .values(status=ReferenceStatus.failed)
+            )
+            db.commit()
+
+            logger.exception("Credibility analysis failed for batch %s: %s", reference_ids, e)
+            return
+
+        # Reports are committed; each webhook is best-effort and guarded on its own
+        for reference, report in zip(references, reports):
+            _queue_reference_analyzed(reference, report)
+
+
+def _queue_reference_analyzed(reference: Reference, report) -> None:
+    """
+    Hand the analyzed reference to the webhook queue.
+
+    Best-effort: the analysis is already committed, so a failed enqueue
+    (e.g. broker down) is logged and never marks the reference failed.
+    """
+    try:
+        _enqueue_reference_analyzed(reference, report)
+    except Exception as e:
+        logger.warning("Could not queue N8N webhook for %s (analysis still succeeded): %s", reference.reference_id, e)
+
+
+def _enqueue_reference_analyzed(reference: Reference, report) -> None:
+    """Send the webhook task for an analyzed reference to the webhooks queue."""
+    # Webhook delivery is I/O bound and must not hold up the analysis queue
+    send_reference_analyzed_task.apply_async(
+        kwargs={
+            "reference_id": str(reference.reference_id),
+            "url": reference.url,
+            "title": reference.title,
+            "author": reference.author,
+            "domain": reference.domain,
+            "credibility_score": report.total_score,
+            "breakdown": {
+                "domain_score": report.domain_score,
+                "metadata_score": report.metadata_score,
+                "rag_score": report.rag_score,
+                "ai_score": report.ai_score
+            }
+        },
+        queue="webhooks"
+    )
+
+
+@celery_app.task(queue="webhooks")
+def send_reference_analyzed_task(**payload: Any):
+    """Send an analyzed reference to the N8N webhook."""
+    try:
+        n8n_service = N8NService()
+        _run_async(n8n_service.send_reference_analyzed(**payload))
+    except Exception as n8n_error:
+        # Don't fail analysis if N8N webhook fails
+        logger.warning("N8N webhook failed (analysis still succeeded): %s", n8n_error)
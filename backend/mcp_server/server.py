@@ -1,131 +1,244 @@
 # File: backend/mcp_server/server.py
 
 import asyncio
-import json
+import logging
+import os
+import sys
 from typing import Any
+import orjson
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+# Make backend/ (the app package) importable once, at the entry point,
+# rather than from every tool module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # Import refactored tools that delegate to strategies
-from tools.check_reference_tool import check_reference
+from tools.check_reference_tool import check_reference, check_references
 from tools.domain_tool import get_domain_reputation
 from tools.metadata_tool import analyze_metadata
 from tools.rag_tool import search_similar_sources
+from tools.domain_tool import db_session as domain_db_session
+
+from app.schemas.reference import MAX_BATCH_URLS
+from app.services.rag_service import warm_up_embedding_model
+from app.strategies.domain_strategy import preload_domain_cache
+
+logger = logging.getLogger(__name__)
 
 
 # Initialize MCP server
 app = Server("reference-checker-mcp")
 
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """
-    List available tools for reference checking.
-    
-    All tools delegate to existing strategies - no duplicate logic!
-    """
-    return [
-        Tool(
-            name="check_reference",
-            description=(
-                "Perform comprehensive credibility analysis on a reference URL. "
-                "Uses the CredibilityAnalyzer service which orchestrates all 4 strategies: "
-                "Domain Reputation, Metadata Quality, Cross-Reference (RAG), and AI Analysis. "
-                "This is the primary tool for complete reference checking."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "url": {
-                        "type": "string",
-                        "description": "The URL to check for credibility"
-                    },
-                    "title": {
-                        "type": "string",
-                        "description": "Optional: Article/paper title"
-                    },
-                    "author": {
-                        "type": "string",
-                        "description": "Optional: Author name(s)"
-                    },
-                    "publication_date": {
-                        "type": "string",
-                        "description": "Optional: Publication date (YYYY-MM-DD format)"
-                    }
-                },
-                "required": ["url"]
-            }
+def _dump(result: Any) -> str:
+    """Serialize a tool result as indented JSON text (orjson: C encoder, numpy values as-is)."""
+    return orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+# Static tool schemas, built once at import
+_TOOLS: list[Tool] = [
+    Tool(
+        name="check_reference",
+        description=(
+            "Perform comprehensive credibility analysis on a reference URL. "
+            "Uses the CredibilityAnalyzer service which orchestrates all 4 strategies: "
+            "Domain Reputation, Metadata Quality, Cross-Reference (RAG), and AI Analysis. "
+            "This is the primary tool for complete reference checking."
         ),
-        Tool(
-            name="get_domain_reputation",
-            description=(
-                "Look up domain reputation using the DomainAnalysisStrategy. "
-                "Returns credibility score (0-30), category (academic, government, news, etc.), "
-                "and verification status. Useful for quick domain checks."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain": {
-                        "type": "string",
-                        "description": "Domain to look up (e.g., 'nature.com', 'arxiv.org')"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "url": {
+                    "type": "string",
+                    "description": "The URL to check for credibility"
+                },
+                "title": {
+                    "type": "string",
+                    "description": "Optional: Article/paper title"
+                },
+                "author": {
+                    "type": "string",
+                    "description": "Optional: Author name(s)"
                 },
-                "required": ["domain"]
-            }
+                "publication_date": {
+                    "type": "string",
+                    "description": "Optional: Publication date (YYYY-MM-DD format)"
+                }
+            },
+            "required": ["url"]
+        }
+    ),
+    Tool(
+        name="check_references_batch",
+        description=(
+            "Perform the same analysis as check_reference on several references at once. "
+            "Pages are scraped concurrently and the strategies process the whole batch together "
+            "(one embedding pass, batched AI scoring), so this is much faster than repeated "
+            "check_reference calls when scanning a bibliography."
         ),
-        Tool(
-            name="analyze_metadata",
-            description=(
-                "Analyze metadata quality using the MetadataAnalysisStrategy. "
-                "Evaluates completeness of author, publication date, and recency. "
-                "Returns score (0-20) and detailed breakdown."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "title": {
-                        "type": "string",
-                        "description": "Article/paper title"
-                    },
-                    "author": {
-                        "type": "string",
-                        "description": "Author name(s)"
-                    },
-                    "publication_date": {
-                        "type": "string",
-                        "description": "Publication date (YYYY-MM-DD format)"
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "items": {
+                    "type": "array",
+                    "description": "References to check",
+                    "minItems": 1,
+                    "maxItems": MAX_BATCH_URLS,
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "url": {
+                                "type": "string",
+                                "description": "The URL to check for credibility"
+                            },
+                            "title": {
+                                "type": "string",
+                                "description": "Optional: Article/paper title"
+                            },
+                            "author": {
+                                "type": "string",
+                                "description": "Optional: Author name(s)"
+                            },
+                            "publication_date": {
+                                "type": "string",
+                                "description": "Optional: Publication date (YYYY-MM-DD format)"
+                            }
+                        },
+                        "required": ["url"]
                     }
+                }
+            },
+            "required": ["items"]
+        }
+    ),
+    Tool(
+        name="get_domain_reputation",
+        description=(
+            "Look up domain reputation using the DomainAnalysisStrategy. "
+            "Returns credibility score (0-30), category (academic, government, news, etc.), "
+            "and verification status. Useful for quick domain checks."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain": {
+                    "type": "string",
+                    "description": "Domain to look up (e.g., 'nature.com', 'arxiv.org')"
+                }
+            },
+            "required": ["domain"]
+        }
+    ),
+    Tool(
+        name="analyze_metadata",
+        description=(
+            "Analyze metadata quality using the MetadataAnalysisStrategy. "
+            "Evaluates completeness of author, publication date, and recency. "
+            "Returns score (0-20) and detailed breakdown."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "title": {
+                    "type": "string",
+                    "description": "Article/paper title"
+                },
+                "author": {
+                    "type": "string",
+                    "description": "Author name(s)"
                 },
-                "required": []
-            }
+                "publication_date": {
+                    "type": "string",
+                    "description": "Publication date (YYYY-MM-DD format)"
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="search_similar_sources",
+        description=(
+            "Search for similar credible sources using the RAGAnalysisStrategy. "
+            "Uses vector similarity search across our database of verified sources. "
+            "Returns score (0-25) based on number and quality of matches. "
+            "Useful for finding corroborating sources or related research."
         ),
-        Tool(
-            name="search_similar_sources",
-            description=(
-                "Search for similar credible sources using the RAGAnalysisStrategy. "
-                "Uses vector similarity search across our database of verified sources. "
-                "Returns score (0-25) based on number and quality of matches. "
-                "Useful for finding corroborating sources or related research."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Search query (e.g., 'climate change machine learning', 'vaccine efficacy')"
-                    },
-                    "top_k": {
-                        "type": "integer",
-                        "description": "Number of results to return (default: 5)",
-                        "default": 5
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query (e.g., 'climate change machine learning', 'vaccine efficacy')"
                 },
-                "required": ["query"]
-            }
-        )
-    ]
+                "top_k": {
+                    "type": "integer",
+                    "description": "Number of results to return (default: 5)",
+                    "default": 5
+                }
+            },
+            "required": ["query"]
+        }
+    )
+]
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """
+    List available tools for reference checking.
+    
+    All tools delegate to existing strategies - no duplicate logic!
+    """
+    return _TOOLS
+
+
+async def _handle_check_reference(arguments: Any) -> Any:
+    """Full credibility analysis using CredibilityAnalyzer."""
+    return await check_reference(
+        url=arguments.get("url"),
+        title=arguments.get("title"),
+        author=arguments.get("author"),
+        publication_date=arguments.get("publication_date")
+    )
+
+
+async def _handle_check_references_batch(arguments: Any) -> Any:
+    """Batched credibility analysis using CredibilityAnalyzer."""
+    items = arguments.get("items") or []
+    if len(items) > MAX_BATCH_URLS:
+        raise ValueError(f"At most {MAX_BATCH_URLS} items per batch")
+    return await check_references(items)
+
+
+async def _handle_get_domain_reputation(arguments: Any) -> Any:
+    """Domain reputation using DomainAnalysisStrategy."""
+    return await get_domain_reputation(arguments.get("domain"))
+
+
+async def _handle_analyze_metadata(arguments: Any) -> Any:
+    """Metadata analysis using MetadataAnalysisStrategy."""
+    return await analyze_metadata(
+        title=arguments.get("title"),
+        author=arguments.get("author"),
+        publication_date=arguments.get("publication_date")
+    )
+
+
+async def _handle_search_similar_sources(arguments: Any) -> Any:
+    """RAG search using RAGAnalysisStrategy."""
+    return await search_similar_sources(arguments.get("query"), arguments.get("top_k", 5))
+
+
+# Tool name -> handler
+_DISPATCH = {
+    "check_reference": _handle_check_reference,
+    "check_references_batch": _handle_check_references_batch,
+    "get_domain_reputation": _handle_get_domain_reputation,
+    "analyze_metadata": _handle_analyze_metadata,
+    "search_similar_sources": _handle_search_similar_sources,
+}
 
 
 @app.call_tool()
@@ -136,61 +249,40 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     All tools now use existing strategies - SINGLE SOURCE OF TRUTH!
     check_reference uses CredibilityAnalyzer which orchestrates all 4 strategies.
     """
+    handler = _DISPATCH.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
     
-    if name == "check_reference":
-        # Full credibility analysis using CredibilityAnalyzer
-        result = await check_reference(
-            url=arguments.get("url"),
-            title=arguments.get("title"),
-            author=arguments.get("author"),
-            publication_date=arguments.get("publication_date")
-        )
-        
-        return [TextContent(
-            type="text",
-            text=json.dumps(result, indent=2)
-        )]
-    
-    elif name == "get_domain_reputation":
-        # Domain reputation using DomainAnalysisStrategy
-        domain = arguments.get("domain")
-        result = await get_domain_reputation(domain)
-        
-        return [TextContent(
-            type="text",
-            text=json.dumps(result, indent=2)
-        )]
-    
-    elif name == "analyze_metadata":
-        # Metadata analysis using MetadataAnalysisStrategy
-        result = await analyze_metadata(
-            title=arguments.get("title"),
-            author=arguments.get("author"),
-            publication_date=arguments.get("publication_date")
-        )
-        
-        return [TextContent(
-            type="text",
-            text=json.dumps(result, indent=2)
-        )]
+    result = await handler(arguments)
     
-    elif name == "search_similar_sources":
-        # RAG search using RAGAnalysisStrategy
-        query = arguments.get("query")
-        top_k = arguments.get("top_k", 5)
-        result = await search_similar_sources(query, top_k)
-        
-        return [TextContent(
-            type="text",
-            text=json.dumps(result, indent=2)
-        )]
+    return [TextContent(
+        type="text",
+        text=_dump(result)
+    )]
+
+
+def _warm_up() -> None:
+    """Load the embedding model and domain reputations before the first tool call."""
+    try:
+        warm_up_embedding_model()
+    except Exception as e:
+        # The model will load lazily on the first RAG call instead
+        logger.warning("Embedding model warm-up failed: %s", e)
     
-    else:
-        raise ValueError(f"Unknown tool: {name}")
+    try:
+        preload_domain_cache(domain_db_session)
+    except Exception as e:
+        # Domains will be cached on first lookup instead
+        logger.warning("Domain cache preload failed: %s", e)
+    finally:
+        domain_db_session.remove()
 
 
 async def main():
     """Run the MCP server."""
+    # Off the event loop: loading the weights takes seconds
+    await asyncio.to_thread(_warm_up)
+    
     async with stdio_server() as (read_stream, write_stream):
         await app.run(
             read_stream,
@@ -1,25 +1,50 @@
 # File: backend/mcp_server/tools/check_reference_tool.py
 
-import os
-import sys
-from typing import Dict, Any, Optional
-from datetime import datetime
+import asyncio
+from bisect import bisect_right
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from uuid import UUID
 
-# Add parent directory to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+from cachetools import TTLCache
+from sqlalchemy import select
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from app.services.credibility_analyzer import CredibilityAnalyzer
 from app.services.reference_service import ReferenceService
-from app.services.scraper_service import WebScraperService
-from app.config import settings
+from app.database import AsyncSessionLocal, SessionLocal
+from app.models import Reference
+from app.utils.dates import parse_ymd
 
 
-# Create database session
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
+# Credibility levels by total score (out of 100): <20, 20-39, 40-59, 60-79, >=80
+_LEVEL_THRESHOLDS = (20, 40, 60, 80)
+_LEVELS = ("highly_unreliable", "unreliable", "questionable", "credible", "highly_credible")
+
+# For MCP calls without authentication, references belong to a system user
+SYSTEM_USER_ID = UUID('00000000-0000-0000-0000-000000000000')
+
+# Query parameters that only track the visitor and never change the page
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid", "mc_cid", "mc_eid"})
+
+# Identical checks share work: concurrent ones await the same future,
+# repeats within RECENT_RESULT_TTL get the finished result
+RECENT_RESULT_TTL = 300
+RECENT_RESULT_MAXSIZE = 1000
+
+CheckKey = Tuple[str, Optional[str], Optional[str], Optional[str], Optional[str]]
+
+_inflight: Dict[CheckKey, asyncio.Future] = {}
+_recent_results: TTLCache = TTLCache(maxsize=RECENT_RESULT_MAXSIZE, ttl=RECENT_RESULT_TTL)
+
+
+def _normalize_url(url: str) -> str:
+    """Canonical form of url for deduplication: lowercase scheme/host, no tracking params or fragment."""
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.startswith("utm_") and key not in _TRACKING_PARAMS
+    ]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ""))
 
 
 async def check_reference(
@@ -32,6 +57,9 @@ async def check_reference(
     """
     Perform full credibility analysis using CredibilityAnalyzer.
     
+    Concurrent calls for the same (normalized) URL and arguments run the
+    pipeline once; repeats within RECENT_RESULT_TTL reuse its result.
+    
     Args:
         url: URL to check
         title: Optional title
@@ -42,103 +70,202 @@ async def check_reference(
     Returns:
         Complete credibility analysis
     """
-    db = SessionLocal()
+    key = (_normalize_url(url), title, author, publication_date, user_id)
     
+    result = _recent_results.get(key)
+    if result is not None:
+        return result
+    
+    inflight = _inflight.get(key)
+    if inflight is not None:
+        # shield: a waiter giving up must not cancel the shared work
+        return await asyncio.shield(inflight)
+    
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
     try:
-        # Create or use user ID
-        if not user_id:
-            # For MCP calls without authentication, use a system user ID
-            user_id = UUID('00000000-0000-0000-0000-000000000000')
+        result = await _check_reference(url, title, author, publication_date, user_id)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # mark retrieved when no one else was waiting
+        raise
+    else:
+        future.set_result(result)
+        _recent_results[key] = result
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+
+async def _check_reference(
+    url: str,
+    title: Optional[str],
+    author: Optional[str],
+    publication_date: Optional[str],
+    user_id: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Run the scrape + analysis pipeline for one reference.
+    
+    Args:
+        url: URL to check
+        title: Optional title
+        author: Optional author
+        publication_date: Optional publication date (YYYY-MM-DD)
+        user_id: Optional user ID (uses system user if not provided)
         
-        # 1. Create reference
-        ref_service = ReferenceService(db)
-        reference = await ref_service.create_reference(url, user_id)
+    Returns:
+        Complete credibility analysis
+    """
+    db = SessionLocal()
+    
+    try:
+        user_id = user_id or SYSTEM_USER_ID
         
-        # 2. Scrape metadata if not provided
-        if not (title and author and publication_date):
-            try:
-                scraper = WebScraperService()
-                scraped = scraper.scrape_metadata(url)  # SYNC method
-                
-                # Use scraped data as fallback
-                title = title or scraped.get('title')
-                author = author or scraped.get('author')
-                publication_date = publication_date or scraped.get('publication_date')
-            except Exception as e:
-                print(f"Warning: Web scraping failed: {e}")
+        # 1. Create reference (scrapes title/author/date, through the metadata cache)
+        async with AsyncSessionLocal() as async_db:
+            ref_service = ReferenceService(async_db)
+            reference = await ref_service.create_reference(url, user_id)
         
-        # 3. Update reference with metadata
-        if title or author or publication_date:
-            pub_date_obj = None
-            if publication_date:
-                try:
-                    pub_date_obj = datetime.fromisoformat(publication_date).date()
-                except (ValueError, TypeError):
-                    pass
-            
-            reference = ref_service.update_reference_metadata(
-                reference.reference_id,
-                title=title,
-                author=author,
-                publication_date=pub_date_obj
-            )
+            # 2. Caller-supplied metadata overrides what was scraped
+            if title or author or publication_date:
+                reference = await ref_service.update_reference_metadata(
+                    reference.reference_id,
+                    title=title,
+                    author=author,
+                    publication_date=_parse_date(publication_date)
+                )
         
-        # 4. Analyze with CredibilityAnalyzer
+        # 3. Analyze with CredibilityAnalyzer (sync session owns the reference from here on)
+        reference = db.get(Reference, reference.reference_id)
         analyzer = CredibilityAnalyzer(db)
         report = await analyzer.analyze_reference(reference)
         
-        # 5. Format and return response
-        return {
-            "url": url,
-            "reference_id": str(reference.reference_id),
-            "domain": reference.domain,
-            "title": reference.title,
-            "author": reference.author,
-            "publication_date": reference.publication_date.isoformat() if reference.publication_date else None,
-            "credibility_analysis": {
-                "total_score": report.total_score,
-                "max_score": 100,
-                "credibility_level": _get_credibility_level(report.total_score),
-                "breakdown": {
-                    "domain": {
-                        "score": report.domain_score,
-                        "max_score": 30,
-                        "explanation": report.domain_explanation
-                    },
-                    "metadata": {
-                        "score": report.metadata_score,
-                        "max_score": 20,
-                        "explanation": report.metadata_explanation
-                    },
-                    "rag": {
-                        "score": report.rag_score,
-                        "max_score": 25,
-                        "explanation": report.rag_explanation
-                    },
-                    "ai": {
-                        "score": report.ai_score,
-                        "max_score": 25,
-                        "explanation": report.ai_explanation
-                    }
-                },
-                "red_flags": report.red_flags
-            },
-            "analyzed_at": report.created_at.isoformat()
+        # 4. Format and return response
+        return _format_result(url, reference, report)
+    
+    finally:
+        db.close()
+
+
+async def check_references(
+    items: List[Dict[str, Any]],
+    user_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Perform full credibility analysis on several references at once.
+    
+    Pages are scraped concurrently and every strategy sees the whole
+    batch, so the RAG strategy embeds all titles in one encode call and
+    the AI strategy scores them with a few batched requests, instead of
+    one pass per reference. Use this for bibliography scans.
+    
+    Args:
+        items: Dicts with "url" and optional "title", "author",
+            "publication_date" (YYYY-MM-DD), as for check_reference
+        user_id: Optional user ID (uses system user if not provided)
+        
+    Returns:
+        One complete credibility analysis per item, in input order
+    """
+    if not items:
+        return []
+    
+    db = SessionLocal()
+    
+    try:
+        user_id = user_id or SYSTEM_USER_ID
+        urls = [item["url"] for item in items]
+        
+        # 1. Create references (scrapes run concurrently, one INSERT commit)
+        async with AsyncSessionLocal() as async_db:
+            ref_service = ReferenceService(async_db)
+            references = await ref_service.create_references(urls, user_id)
+            reference_ids = [reference.reference_id for reference in references]
+            
+            # 2. Caller-supplied metadata overrides what was scraped
+            for item, reference_id in zip(items, reference_ids):
+                if item.get("title") or item.get("author") or item.get("publication_date"):
+                    await ref_service.update_reference_metadata(
+                        reference_id,
+                        title=item.get("title"),
+                        author=item.get("author"),
+                        publication_date=_parse_date(item.get("publication_date"))
+                    )
+        
+        # 3. Analyze the whole batch (sync session owns the references from here on)
+        loaded = {
+            reference.reference_id: reference
+            for reference in db.scalars(select(Reference).where(Reference.reference_id.in_(reference_ids)))
         }
+        references = [loaded[reference_id] for reference_id in reference_ids]
+        analyzer = CredibilityAnalyzer(db)
+        reports = await analyzer.analyze_references(references)
+        
+        # 4. Format and return responses
+        return [
+            _format_result(url, reference, report)
+            for url, reference, report in zip(urls, references, reports)
+        ]
     
     finally:
         db.close()
 
 
+def _parse_date(publication_date: Optional[str]):
+    """Parse a caller-supplied YYYY-MM-DD date, ignoring values that don't parse."""
+    if not publication_date:
+        return None
+    try:
+        return parse_ymd(publication_date)
+    except (ValueError, TypeError):
+        return None
+
+
+def _format_result(url: str, reference: Reference, report) -> Dict[str, Any]:
+    """Build the MCP response for one analyzed reference."""
+    return {
+        "url": url,
+        "reference_id": str(reference.reference_id),
+        "domain": reference.domain,
+        "title": reference.title,
+        "author": reference.author,
+        "publication_date": reference.publication_date.isoformat() if reference.publication_date else None,
+        "credibility_analysis": {
+            "total_score": report.total_score,
+            "max_score": 100,
+            "credibility_level": _get_credibility_level(report.total_score),
+            "breakdown": {
+                "domain": {
+                    "score": report.domain_score,
+                    "max_score": 30,
+                    "explanation": report.domain_explanation
+                },
+                "metadata": {
+                    "score": report.metadata_score,
+                    "max_score": 20,
+                    "explanation": report.metadata_explanation
+                },
+                "rag": {
+                    "score": report.rag_score,
+                    "max_score": 25,
+                    "explanation": report.rag_explanation
+                },
+                "ai": {
+                    "score": report.ai_score,
+                    "max_score": 25,
+                    "explanation": report.ai_explanation
+                }
+            },
+            "red_flags": report.red_flags
+        },
+        "analyzed_at": report.created_at.isoformat()
+    }
+
+
 def _get_credibility_level(score: int) -> str:
     """Determine credibility level based on score."""
-    if score >= 80:
-        return "highly_credible"
-    elif score >= 60:
-        return "credible"
-    elif score >= 40:
-        return "questionable"
-    elif score >= 20:
-        return "unreliable"
-    else:
-        return "highly_unreliable"
\ No newline at end of file
+    return _LEVELS[bisect_right(_LEVEL_THRESHOLDS, score)]
@@ -1,21 +1,25 @@
 # File: backend/mcp_server/tools/domain_tool.py
 
-import os
-import sys
+import asyncio
 from typing import Dict, Any
 
-# Add parent directory to path to import from app
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
-
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session
+from app.database import SessionLocal
 from app.strategies.domain_strategy import DomainAnalysisStrategy
-from app.config import settings
 
 
-# Create database session
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
+# Thread-local session released after every call; the strategy is built
+# once and reaches the database through this proxy
+db_session = scoped_session(SessionLocal)
+_strategy = DomainAnalysisStrategy(db_session)
+
+
+def _analyze(reference) -> Dict[str, Any]:
+    """Run the strategy in a worker thread, releasing that thread's session."""
+    try:
+        return _strategy.analyze(reference)
+    finally:
+        db_session.remove()
 
 
 async def get_domain_reputation(domain: str) -> Dict[str, Any]:
@@ -30,27 +34,21 @@ async def get_domain_reputation(domain: str) -> Dict[str, Any]:
     Returns:
         Dictionary with domain reputation info
     """
-    db = SessionLocal()
+    # Create a minimal Reference object for the strategy
+    # We only need the domain field populated
+    from app.models import Reference
+    temp_reference = Reference(domain=domain)
     
-    try:
-        # Create a minimal Reference object for the strategy
-        # We only need the domain field populated
-        from app.models import Reference
-        temp_reference = Reference(domain=domain)
-        
-        # Use the existing strategy
-        strategy = DomainAnalysisStrategy(db)
-        result = strategy.analyze(temp_reference)
-        
-        # Convert to MCP-compatible format
-        return {
-            "domain": domain,
-            "score": result["score"],
-            "max_score": strategy.max_score,
-            "verified": result.get("details", {}).get("verified", False),
-            "category": result.get("details", {}).get("category", "unknown"),
-            "explanation": result["explanation"]
-        }
+    # Use the existing strategy (its database lookup must not block the event loop)
+    strategy = _strategy
+    result = await asyncio.to_thread(_analyze, temp_reference)
     
-    finally:
-        db.close()
\ No newline at end of file
+    # Convert to MCP-compatible format
+    return {
+        "domain": domain,
+        "score": result["score"],
+        "max_score": strategy.max_score,
+        "verified": result.get("details", {}).get("verified", False),
+        "category": result.get("details", {}).get("category", "unknown"),
+        "explanation": result["explanation"]
+    }
\ No newline at end of file
@@ -1,22 +1,17 @@
 # File: backend/mcp_server/tools/metadata_tool.py
 
-import os
-import sys
 from typing import Dict, Any, Optional
-from datetime import datetime
 
-# Add parent directory to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
-
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session
+from app.database import SessionLocal
 from app.strategies.metadata_strategy import MetadataAnalysisStrategy
-from app.config import settings
+from app.utils.dates import parse_ymd
 
 
-# Create database session
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
+# Thread-local session released after every call; the strategy is built
+# once and reaches the database through this proxy
+db_session = scoped_session(SessionLocal)
+_strategy = MetadataAnalysisStrategy(db_session)
 
 
 async def analyze_metadata(
@@ -37,8 +32,6 @@ async def analyze_metadata(
     Returns:
         Dictionary with metadata analysis
     """
-    db = SessionLocal()
-    
     try:
         # Create a minimal Reference object for the strategy
         from app.models import Reference
@@ -47,7 +40,7 @@ async def analyze_metadata(
         pub_date_obj = None
         if publication_date:
             try:
-                pub_date_obj = datetime.fromisoformat(publication_date).date()
+                pub_date_obj = parse_ymd(publication_date)
             except (ValueError, TypeError):
                 pass  # Let strategy handle invalid dates
         
@@ -58,7 +51,7 @@ async def analyze_metadata(
         )
         
         # Use the existing strategy
-        strategy = MetadataAnalysisStrategy(db)
+        strategy = _strategy
         result = strategy.analyze(temp_reference)
         
         # Convert to MCP-compatible format
@@ -72,4 +65,4 @@ async def analyze_metadata(
         }
     
     finally:
-        db.close()
\ No newline at end of file
+        db_session.remove()
\ No newline at end of file
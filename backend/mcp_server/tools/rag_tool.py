@@ -1,60 +1,122 @@
 # File: backend/mcp_server/tools/rag_tool.py
 
-import os
-import sys
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, List, Optional, Set, Tuple
 
-# Add parent directory to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
-
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session
+from app.database import SessionLocal
+from app.models import Reference
 from app.strategies.rag_strategy import RAGAnalysisStrategy
-from app.config import settings
 
 
-# Create database session
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
+# Thread-local session released after every call; the strategy is built
+# once and reaches the database through this proxy
+db_session = scoped_session(SessionLocal)
+_strategy = RAGAnalysisStrategy(db_session)
+
+# Concurrent searches arriving within this window share one embedding pass
+BATCH_MAX_WAIT = 0.005  # seconds
+BATCH_MAX_SIZE = 32
+
+
+def _analyze_batch(references: List[Reference]) -> List[Any]:
+    """Run the strategy over a batch in a worker thread, releasing its session."""
+    try:
+        return _strategy.analyze_batch(references)
+    finally:
+        db_session.remove()
+
+
+class _AnalysisBatcher:
+    """
+    Micro-batcher for concurrent RAG searches.
+
+    Callers await analyze(); pending references are flushed to
+    RAGAnalysisStrategy.analyze_batch (one model.encode for all of them)
+    after BATCH_MAX_WAIT, or as soon as BATCH_MAX_SIZE are waiting.
+    """
+
+    def __init__(self, max_wait: float = BATCH_MAX_WAIT, max_size: int = BATCH_MAX_SIZE):
+        self.max_wait = max_wait
+        self.max_size = max_size
+        self._pending: List[Tuple[Reference, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()  # keep running flushes referenced
+
+    async def analyze(self, reference: Reference) -> Dict[str, Any]:
+        """Queue a reference and wait for its analysis."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((reference, future))
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Start analyzing everything queued so far."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Reference, asyncio.Future]]) -> None:
+        """Analyze one batch off the event loop and resolve its futures."""
+        try:
+            results = await asyncio.to_thread(_analyze_batch, [reference for reference, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue  # caller went away
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+_batcher = _AnalysisBatcher()
 
 
 async def search_similar_sources(query: str, top_k: int = 5) -> Dict[str, Any]:
     """
     Search for similar sources using the RAGAnalysisStrategy.
-    
+
     This delegates to the existing strategy instead of duplicating logic.
-    
+
     Args:
         query: Search query text
         top_k: Number of results to return (default: 5)
-        
+
     Returns:
         Dictionary with similar sources and analysis
     """
-    db = SessionLocal()
-    
-    try:
-        # Create a minimal Reference object with just the query as title
-        from app.models import Reference
-        temp_reference = Reference(title=query)
-        
-        # Use the existing strategy
-        strategy = RAGAnalysisStrategy(db)
-        result = strategy.analyze(temp_reference)
-        
-        # Extract details
-        details = result.get("details", {})
-        similar_sources = details.get("similar_sources", [])
-        
-        # Convert to MCP-compatible format
-        return {
-            "score": result["score"],
-            "max_score": strategy.max_score,
-            "similar_sources": similar_sources[:top_k],  # Limit to top_k
-            "count": details.get("count", 0),
-            "average_similarity": details.get("average_similarity", 0.0),
-            "explanation": result["explanation"]
-        }
-    
-    finally:
-        db.close()
\ No newline at end of file
+    # Create a minimal Reference object with just the query as title
+    temp_reference = Reference(title=query)
+
+    # Use the existing strategy (batched with concurrent searches)
+    strategy = _strategy
+    result = await _batcher.analyze(temp_reference)
+
+    # Extract details
+    details = result.get("details", {})
+    similar_sources = details.get("similar_sources", [])
+
+    # Convert to MCP-compatible format
+    return {
+        "score": result["score"],
+        "max_score": strategy.max_score,
+        "similar_sources": similar_sources[:top_k],  # Limit to top_k
+        "count": details.get("count", 0),
+        "average_similarity": details.get("average_similarity", 0.0),
+        "explanation": result["explanation"]
+    }
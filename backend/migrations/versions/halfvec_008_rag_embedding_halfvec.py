@@ -0,0 +1,44 @@
+"""Store RAG embeddings as halfvec(384)
+
+Embeddings are normalized, so fp16 keeps cosine ranking effectively
+unchanged while halving the bytes stored and scanned by the HNSW index.
+Requires the pgvector extension 0.7.0 or newer.
+
+Revision ID: halfvec_008
+Revises: processing_007
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'halfvec_008'
+down_revision = 'processing_007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_rag_sources_embedding_hnsw', table_name='rag_sources')
+    op.execute(
+        "ALTER TABLE rag_sources "
+        "ALTER COLUMN embedding_vector TYPE halfvec(384) "
+        "USING embedding_vector::halfvec(384)"
+    )
+    op.execute(
+        "CREATE INDEX ix_rag_sources_embedding_hnsw ON rag_sources "
+        "USING hnsw (embedding_vector halfvec_cosine_ops)"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_rag_sources_embedding_hnsw', table_name='rag_sources')
+    op.execute(
+        "ALTER TABLE rag_sources "
+        "ALTER COLUMN embedding_vector TYPE vector(384) "
+        "USING embedding_vector::vector(384)"
+    )
+    op.execute(
+        "CREATE INDEX ix_rag_sources_embedding_hnsw ON rag_sources "
+        "USING hnsw (embedding_vector vector_cosine_ops)"
+    )
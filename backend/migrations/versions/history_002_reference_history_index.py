@@ -0,0 +1,28 @@
+"""Composite index for keyset-paginated reference history
+
+Revision ID: history_002
+Revises: initial_001
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'history_002'
+down_revision = 'initial_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_references_user_created',
+        'references',
+        ['user_id', sa.text('created_at DESC'), sa.text('reference_id DESC')],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_references_user_created', table_name='references')
@@ -0,0 +1,40 @@
+"""Normalize RAG embeddings and index them for inner product
+
+Stored vectors are scaled to unit length, so the similarity search can
+rank by inner product (one dot product per candidate) instead of cosine
+distance (which also recomputes both norms). Rankings are unchanged.
+
+Revision ID: normalize_009
+Revises: halfvec_008
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'normalize_009'
+down_revision = 'halfvec_008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_rag_sources_embedding_hnsw', table_name='rag_sources')
+    op.execute(
+        "UPDATE rag_sources "
+        "SET embedding_vector = l2_normalize(embedding_vector) "
+        "WHERE embedding_vector IS NOT NULL"
+    )
+    op.execute(
+        "CREATE INDEX ix_rag_sources_embedding_hnsw ON rag_sources "
+        "USING hnsw (embedding_vector halfvec_ip_ops)"
+    )
+
+
+def downgrade():
+    # Normalized vectors stay valid for cosine search; only the index changes
+    op.drop_index('ix_rag_sources_embedding_hnsw', table_name='rag_sources')
+    op.execute(
+        "CREATE INDEX ix_rag_sources_embedding_hnsw ON rag_sources "
+        "USING hnsw (embedding_vector halfvec_cosine_ops)"
+    )
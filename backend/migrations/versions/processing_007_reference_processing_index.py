@@ -0,0 +1,29 @@
+"""Partial index over references still being analyzed
+
+Revision ID: processing_007
+Revises: uuid_006
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'processing_007'
+down_revision = 'uuid_006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_references_processing',
+        'references',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'processing'")
+    )
+
+
+def downgrade():
+    op.drop_index('ix_references_processing', table_name='references')
@@ -0,0 +1,27 @@
+"""Index user ratings by reference for aggregate queries
+
+Revision ID: ratings_003
+Revises: history_002
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'ratings_003'
+down_revision = 'history_002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_user_ratings_reference_rating',
+        'user_ratings',
+        ['reference_id', 'rating'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_user_ratings_reference_rating', table_name='user_ratings')
@@ -0,0 +1,48 @@
+"""Let Postgres fill timestamps and reference status
+
+Converts created_at/updated_at to timestamptz (existing values are UTC)
+with DEFAULT now(), and gives references.status a 'processing' default.
+
+Revision ID: timestamps_005
+Revises: vector_004
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'timestamps_005'
+down_revision = 'vector_004'
+branch_labels = None
+depends_on = None
+
+TIMESTAMP_COLUMNS = [
+    ('users', 'created_at'),
+    ('domain_reputation', 'created_at'),
+    ('domain_reputation', 'updated_at'),
+    ('rag_sources', 'created_at'),
+    ('references', 'created_at'),
+    ('references', 'updated_at'),
+    ('credibility_reports', 'created_at'),
+    ('user_ratings', 'created_at'),
+]
+
+
+def upgrade():
+    for table, column in TIMESTAMP_COLUMNS:
+        op.execute(
+            f'ALTER TABLE "{table}" '
+            f'ALTER COLUMN {column} TYPE timestamptz USING {column} AT TIME ZONE \'UTC\', '
+            f'ALTER COLUMN {column} SET DEFAULT now()'
+        )
+    op.execute('ALTER TABLE "references" ALTER COLUMN status SET DEFAULT \'processing\'')
+
+
+def downgrade():
+    op.execute('ALTER TABLE "references" ALTER COLUMN status DROP DEFAULT')
+    for table, column in TIMESTAMP_COLUMNS:
+        op.execute(
+            f'ALTER TABLE "{table}" '
+            f'ALTER COLUMN {column} DROP DEFAULT, '
+            f'ALTER COLUMN {column} TYPE timestamp USING {column} AT TIME ZONE \'UTC\''
+        )
@@ -0,0 +1,35 @@
+"""Generate primary key UUIDs in the database
+
+Revision ID: uuid_006
+Revises: timestamps_005
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'uuid_006'
+down_revision = 'timestamps_005'
+branch_labels = None
+depends_on = None
+
+PRIMARY_KEYS = [
+    ('users', 'user_id'),
+    ('domain_reputation', 'domain_id'),
+    ('rag_sources', 'source_id'),
+    ('references', 'reference_id'),
+    ('credibility_reports', 'report_id'),
+    ('user_ratings', 'rating_id'),
+]
+
+
+def upgrade():
+    # gen_random_uuid() is built in from Postgres 13; pgcrypto provides it on older servers
+    op.execute('CREATE EXTENSION IF NOT EXISTS pgcrypto')
+    for table, column in PRIMARY_KEYS:
+        op.execute(f'ALTER TABLE "{table}" ALTER COLUMN {column} SET DEFAULT gen_random_uuid()')
+
+
+def downgrade():
+    for table, column in PRIMARY_KEYS:
+        op.execute(f'ALTER TABLE "{table}" ALTER COLUMN {column} DROP DEFAULT')
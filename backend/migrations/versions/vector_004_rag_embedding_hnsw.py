@@ -0,0 +1,40 @@
+"""Store RAG embeddings as pgvector vector(384) with an HNSW index
+
+The initial schema created embedding_vector as a plain string, which
+the pgvector-typed model cannot search. Existing values are text in
+pgvector's '[x, y, ...]' format and cast directly.
+
+Revision ID: vector_004
+Revises: ratings_003
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'vector_004'
+down_revision = 'ratings_003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.execute(
+        "ALTER TABLE rag_sources "
+        "ALTER COLUMN embedding_vector TYPE vector(384) "
+        "USING embedding_vector::vector(384)"
+    )
+    op.execute(
+        "CREATE INDEX ix_rag_sources_embedding_hnsw ON rag_sources "
+        "USING hnsw (embedding_vector vector_cosine_ops)"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_rag_sources_embedding_hnsw', table_name='rag_sources')
+    op.execute(
+        "ALTER TABLE rag_sources "
+        "ALTER COLUMN embedding_vector TYPE varchar "
+        "USING embedding_vector::text"
+    )
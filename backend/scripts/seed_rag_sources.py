@@ -8,6 +8,11 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from sentence_transformers import SentenceTransformer
 from app.database import SessionLocal
 from app.models import RAGSource, SourceAddedBy
+from app.services.rag_service import bulk_insert_sources
+
+
+# Sources per forward pass when embedding the seed data
+ENCODE_BATCH_SIZE = 64
 
 
 def seed_rag_sources():
@@ -41,34 +46,32 @@ def seed_rag_sources():
     model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
     print("✅ Model loaded!")
     
-    # Create RAG sources with embeddings ONE BY ONE (not bulk)
-    for idx, source_data in enumerate(sources_data, 1):
-        # Generate embedding from title + abstract
-        text_to_embed = f"{source_data['title']}. {source_data['abstract']}"
-        embedding = model.encode(text_to_embed)
-        
-        # Convert numpy array to Python list, then to string for pgvector
-        embedding_list = embedding.tolist()
-        
-        source = RAGSource(
-            url=source_data['url'],
-            title=source_data['title'],
-            content_text=source_data['abstract'],
-            embedding_vector=embedding_list,  # pgvector will handle the conversion
-            domain=source_data['domain'],
-            credibility_score=source_data['credibility_score'],
-            added_by=SourceAddedBy.manual
-        )
-        
-        # Add and commit one by one
-        db.add(source)
-        
-        if idx % 10 == 0:
-            print(f"   Processed {idx}/{len(sources_data)} sources...")
-            db.commit()  # Commit every 10
+    # Embed title + abstract for every source in one batched encode call
+    texts = [f"{source_data['title']}. {source_data['abstract']}" for source_data in sources_data]
+    print(f"🧮 Encoding {len(texts)} sources...")
+    embeddings = model.encode(
+        texts,
+        batch_size=ENCODE_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=True
+    )
+    
+    # Build all rows first, then load them with batched multi-row INSERTs
+    rows = [
+        {
+            "url": source_data['url'],
+            "title": source_data['title'],
+            "content_text": source_data['abstract'],
+            "embedding_vector": embedding,  # Vector column binds the numpy array directly
+            "domain": source_data['domain'],
+            "credibility_score": source_data['credibility_score'],
+            "added_by": SourceAddedBy.manual
+        }
+        for source_data, embedding in zip(sources_data, embeddings)
+    ]
     
-    # Final commit
-    db.commit()
+    bulk_insert_sources(db, rows)
     
     print(f"✅ Seeded {len(sources_data)} sources into rag_sources table")
     db.close()
@@ -10,12 +10,14 @@ print(f"Connecting to: {DATABASE_URL[:30]}...")
 engine = create_engine(DATABASE_URL)
 
 with engine.connect() as conn:
-    result = conn.execute(text("SELECT version();"))
+    # Server version and pgvector presence in one round-trip
+    version, has_vector = conn.execute(text(
+        "SELECT version(), EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector');"
+    )).one()
     print("✅ Connected to PostgreSQL!")
-    print(result.fetchone()[0])
+    print(version)
     
-    result = conn.execute(text("SELECT * FROM pg_extension WHERE extname = 'vector';"))
-    if result.fetchone():
+    if has_vector:
         print("✅ pgvector extension is installed!")
     else:
         print("❌ pgvector extension not found")
@@ -0,0 +1,26 @@
+# File: backend/tests/conftest.py
+
+import os
+
+# Tests only need working hashes, not slow ones; set before app settings load
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient for the whole run; app startup/shutdown runs once."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def openapi_schema(client):
+    """The generated OpenAPI schema, fetched and decoded (orjson: C parser) once."""
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    return orjson.loads(response.content)
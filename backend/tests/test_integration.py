@@ -1,16 +1,16 @@
 # File: backend/tests/test_integration_simple.py
 
 import pytest
-from fastapi.testclient import TestClient
 from app.main import app
 
-client = TestClient(app)
+# Registered methods per path, built once from the router table
+ROUTE_INDEX = {route.path: route.methods for route in app.routes if hasattr(route, "methods")}
 
 
 class TestHealthEndpoints:
     """Test basic health and info endpoints."""
     
-    def test_root_endpoint(self):
+    def test_root_endpoint(self, client):
         """Test root endpoint returns correctly."""
         response = client.get("/")
         assert response.status_code == 200
@@ -18,7 +18,7 @@ class TestHealthEndpoints:
         assert "message" in data
         assert data["message"] == "Reference Checker API"
     
-    def test_health_endpoint(self):
+    def test_health_endpoint(self, client):
         """Test health check endpoint."""
         response = client.get("/health")
         assert response.status_code == 200
@@ -29,7 +29,7 @@ class TestHealthEndpoints:
 class TestAuthenticationEndpoints:
     """Test authentication endpoints (without database)."""
     
-    def test_register_endpoint_exists(self):
+    def test_register_endpoint_exists(self, client):
         """Test that register endpoint exists."""
         response = client.post("/api/auth/register", json={
             "email": "test@example.com",
@@ -37,21 +37,26 @@ class TestAuthenticationEndpoints:
         })
         # Should get 422 (validation error) not 404 (not found)
         assert response.status_code in [422, 400, 500]  # Endpoint exists
+
+
+class TestRouteRegistration:
+    """Test routes are registered, straight from the router table (no requests)."""
     
-    def test_login_endpoint_exists(self):
-        """Test that login endpoint exists."""
-        response = client.post("/api/auth/login", json={
-            "email": "test@example.com",
-            "password": "password123"
-        })
-        # Should get 401 (unauthorized) not 404 (not found)
-        assert response.status_code in [401, 500]  # Endpoint exists
+    @pytest.mark.parametrize("path,method", [
+        ("/api/auth/register", "POST"),
+        ("/api/auth/login", "POST"),
+        ("/api/references/check", "POST"),
+        ("/api/references/history", "GET"),
+    ])
+    def test_route_registered(self, path, method):
+        """Test that the route exists for the method."""
+        assert method in ROUTE_INDEX.get(path, set())
 
 
 class TestReferenceEndpoints:
     """Test reference endpoints exist."""
     
-    def test_check_reference_requires_auth(self):
+    def test_check_reference_requires_auth(self, client):
         """Test that check reference requires authentication."""
         response = client.post("/api/references/check", json={
             "url": "https://www.nature.com/test"
@@ -59,7 +64,14 @@ class TestReferenceEndpoints:
         # Should require auth
         assert response.status_code == 401
     
-    def test_history_requires_auth(self):
+    def test_check_batch_requires_auth(self, client):
+        """Test that batch check requires authentication."""
+        response = client.post("/api/references/check/batch", json={
+            "urls": ["https://www.nature.com/test"]
+        })
+        assert response.status_code == 401
+    
+    def test_history_requires_auth(self, client):
         """Test that history requires authentication."""
         response = client.get("/api/references/history")
         assert response.status_code == 401
@@ -68,15 +80,12 @@ class TestReferenceEndpoints:
 class TestDocumentation:
     """Test API documentation is available."""
     
-    def test_openapi_schema_available(self):
+    def test_openapi_schema_available(self, openapi_schema):
         """Test that OpenAPI schema is available."""
-        response = client.get("/openapi.json")
-        assert response.status_code == 200
-        data = response.json()
-        assert "openapi" in data
-        assert "paths" in data
+        assert "openapi" in openapi_schema
+        assert "paths" in openapi_schema
     
-    def test_swagger_docs_available(self):
+    def test_swagger_docs_available(self, client):
         """Test that Swagger UI is available."""
         response = client.get("/docs")
         assert response.status_code == 200
@@ -48,8 +48,8 @@ export const authAPI = {
 // Reference endpoints
 export const referenceAPI = {
   checkReference: (url) => api.post('/api/references/check', { url }),
-  getHistory: (skip = 0, limit = 20) => 
-    api.get(`/api/references/history?skip=${skip}&limit=${limit}`),
+  getHistory: (cursor = null, limit = 20) =>
+    api.get('/api/references/history', { params: { cursor: cursor || undefined, limit } }),
   getReference: (id) => api.get(`/api/references/${id}`),
   reanalyze: (id) => api.post(`/api/references/${id}/reanalyze`),
   deleteReference: (id) => api.delete(`/api/references/${id}`),